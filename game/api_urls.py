@@ -4,8 +4,10 @@ from .views.api import (
     register_user, login_user,
     get_player_deck, get_battle_deck, set_battle_deck,
     create_open_match, list_open_matches, join_match, get_match_state,
+    get_match_changes, get_match_analysis,
     make_move, battle_bot, forfeit_match,
     view_shop, buy_card, 
+    bot_stats,
 )
 
 urlpatterns = [
@@ -21,11 +23,14 @@ urlpatterns = [
     path('match/join/',      join_match,         name='join_match'),
     path('match/<int:match_id>/',      get_match_state, name='match-detail'),
     path('match/<int:match_id>/state/', get_match_state, name='match-state'),
+    path('match/<int:match_id>/changes/', get_match_changes, name='match-changes'),
+    path('match/<int:match_id>/analysis/', get_match_analysis, name='match-analysis'),
 
     path('match/forfeit/', forfeit_match, name='forfeit_match'),
 
     path('battle-bot/', battle_bot, name='battle_bot'),
     path('move/',       make_move,  name='make_move'),
+    path('bot/stats/',  bot_stats,  name='bot_stats'),
 
     path('shop/',     view_shop, name='view_shop'),
     path('shop/buy/', buy_card,  name='buy_card'),
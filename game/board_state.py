@@ -0,0 +1,97 @@
+# game/board_state.py
+"""
+Match.board_state: the authoritative board of a match.
+
+    {"version": 4, "cells": [null, [owner_id, player_card_id, card_id], ...],
+     "log": [[position, [flipped, ...]], ...]}
+
+Nine slots, row by row. *owner_id* is the Player holding the cell now
+(flips change it), *card_id* the Card behind the PlayerCard. *version*
+counts the moves played: version N is the board right after the N-th
+MatchMove. MatchMove rows are the append-only history (who played which
+card where) and are never updated.
+
+*log* lists, per move, where the card went and the cells it took, the
+last entry being move *version*; changes_since() reads it to send
+clients only what changed. It can start late (see below), never more
+than CELLS entries long.
+
+Matches from before board_state was kept are backfilled on first read
+from their MatchMove rows, whose player was kept current by the flips
+back then. Their log only starts with the next move.
+"""
+from game.models import Match, MatchMove
+
+CELLS = 9
+
+
+def empty_state():
+    return {"version": 0, "cells": [None] * CELLS, "log": []}
+
+
+def load_state(match, save=True):
+    """
+    *match*'s board_state, rebuilt from its moves when missing; *save*
+    writes the rebuilt state back unless a move got there first.
+    """
+    state = match.board_state
+    if state and "cells" in state:
+        return state
+    state = empty_state()
+    # flips of those moves are lost: no log
+    moves = MatchMove.objects.filter(match=match).select_related("card").order_by("pk")
+    for m in moves:
+        state["cells"][m.position] = [m.player_id, m.card_id, m.card.card_id]
+        state["version"] += 1
+    match.board_state = state
+    if save:
+        Match.objects.filter(pk=match.pk).exclude(board_state__has_key="cells").update(board_state=state)
+    return state
+
+
+def place(state, position, owner_id, player_card, flips):
+    """
+    Record *player_card* played at *position* by *owner_id*, taking every
+    cell in *flips*, and bump the version. Returns the cells that changed owner.
+    """
+    cells = state["cells"]
+    cells[position] = [owner_id, player_card.id, player_card.card_id]
+    taken = []
+    for pos in flips:
+        if cells[pos][0] != owner_id:
+            cells[pos][0] = owner_id
+            taken.append(pos)
+    state["version"] += 1
+    state.setdefault("log", []).append([position, taken])
+    return taken
+
+
+def changes_since(state, since):
+    """
+    (placed, flipped) since version *since*: the cells played into after
+    it, and the other cells that changed owner. None when the log does not
+    reach back that far (or *since* is not a version of this board), so
+    the client needs the whole board.
+    """
+    log = state.get("log", [])
+    if not state["version"] - len(log) <= since <= state["version"]:
+        return None
+    placed, flipped = [], set()
+    for position, taken in log[len(log) - (state["version"] - since):]:
+        placed.append(position)
+        flipped.update(taken)
+    return placed, sorted(flipped - set(placed))
+
+
+def owner_counts(state):
+    """{player_id: cells owned}."""
+    counts = {}
+    for cell in state["cells"]:
+        if cell is not None:
+            counts[cell[0]] = counts.get(cell[0], 0) + 1
+    return counts
+
+
+def cards_at(state):
+    """{position: Card id} of the occupied cells, as game.utils.flips_for wants it."""
+    return {pos: cell[2] for pos, cell in enumerate(state["cells"]) if cell is not None}
@@ -0,0 +1,107 @@
+# game/bot_stats.py
+"""
+Per-decision search statistics of the bots.
+
+Every move a bot plays through BotStrategy.choose_move leaves one record
+in a bounded in-memory ring buffer (settings.BOT_STATS_BUFFER records per
+process, oldest dropped first):
+
+    at, match_id, strategy, empty_cells, mode,
+    nodes, cutoffs, tt_hits, depth, score, elapsed
+
+Fields a strategy does not measure are None; *mode* says where the move
+came from ("search", "book", "endgame", "ponder", ...). Read it back with
+recent_decisions() / summary(), or over the API at bot/stats/.
+"""
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+FIELDS = ("nodes", "cutoffs", "tt_hits", "depth", "score")
+
+_records = None
+_lock = threading.Lock()
+
+
+def _buffer():
+    global _records
+    if _records is None:
+        _records = deque(maxlen=getattr(settings, "BOT_STATS_BUFFER", 1000))
+    return _records
+
+
+def record_decision(match_id, strategy, empty_cells, stats, elapsed):
+    """Store one decision; *stats* is the strategy's last_stats. Returns the record."""
+    record = {
+        "at": time.time(),
+        "match_id": match_id,
+        "strategy": strategy,
+        "empty_cells": empty_cells,
+        "mode": stats.get("mode", "search"),
+        **{field: stats.get(field) for field in FIELDS},
+        "elapsed": elapsed,
+    }
+    with _lock:
+        _buffer().append(record)
+    return record
+
+
+def recent_decisions(limit=None, strategy=None, match_id=None):
+    """Newest first, optionally filtered by strategy and/or match."""
+    with _lock:
+        records = list(_buffer())
+    records.reverse()
+    if strategy is not None:
+        records = [r for r in records if r["strategy"] == strategy]
+    if match_id is not None:
+        records = [r for r in records if r["match_id"] == match_id]
+    return records[:limit] if limit else records
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else None
+
+
+def _p95(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(1, math.ceil(0.95 * len(values))) - 1]
+
+
+def summary():
+    """{strategy: aggregates over the buffered decisions}."""
+    by_strategy = {}
+    for r in recent_decisions():
+        by_strategy.setdefault(r["strategy"], []).append(r)
+    result = {}
+    for name, records in by_strategy.items():
+        elapsed = [r["elapsed"] for r in records]
+        nodes = [r["nodes"] for r in records if r["nodes"] is not None]
+        searched = [r for r in records if r["nodes"] and r["cutoffs"] is not None]
+        depths = [r["depth"] for r in records if r["depth"] is not None]
+        modes = {}
+        for r in records:
+            modes[r["mode"]] = modes.get(r["mode"], 0) + 1
+        result[name] = {
+            "decisions": len(records),
+            "modes": modes,
+            "elapsed_mean": _mean(elapsed),
+            "elapsed_p95": _p95(elapsed),
+            "elapsed_max": max(elapsed),
+            "nodes_mean": _mean(nodes),
+            # share of expanded nodes that ended in a beta cutoff
+            "prune_rate": (
+                sum(r["cutoffs"] for r in searched) / sum(r["nodes"] for r in searched)
+                if searched else None
+            ),
+            "depth_mean": _mean(depths),
+            "nodes_per_sec": (
+                sum(r["nodes"] for r in searched) / sum(r["elapsed"] for r in searched)
+                if searched else None
+            ),
+        }
+    return result
@@ -0,0 +1,74 @@
+# game/bot_worker.py
+"""
+Bot replies off the request path.
+
+make_move commits the human move and answers straight away; the bot's reply
+is computed here on a small thread pool and pushed to the match_<id> group
+as a "bot_move" event (see MatchConsumer.bot_move).
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from game.events import broadcast_match_event
+from game.models import Match
+from game.ponder import start_pondering, stop_pondering
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BOT_WORKER_THREADS,
+                thread_name_prefix="bot-move",
+            )
+        return _executor
+
+
+def schedule_bot_move(match_id, bot_player_id, announce=None):
+    """
+    Queue the bot's reply once the current transaction has committed.
+    *announce* (the human move's payload) is broadcast first, from the same
+    thread, so watchers always get the human move before the bot's answer.
+    """
+    transaction.on_commit(
+        lambda: _get_executor().submit(_run_bot_move, match_id, bot_player_id, announce)
+    )
+
+
+def _run_bot_move(match_id, bot_player_id, announce):
+    # views import this module, not the other way round
+    from game.views.api import play_bot_turn
+
+    close_old_connections()
+    try:
+        if announce is not None:
+            broadcast_match_event(match_id, "match_move", announce)
+        match = Match.objects.select_related(
+            "player_one__user", "player_two__user", "current_turn"
+        ).get(id=match_id)
+        # forfeited, finished or already answered in the meantime
+        if not match.is_active or match.current_turn_id != bot_player_id:
+            return
+        # the real search gets the CPU; answers pondered so far stay usable
+        stop_pondering(match_id)
+        bot_player = match.current_turn
+        payload = play_bot_turn(match, bot_player)
+        if payload is None:
+            return  # another request played the bot's turn
+        broadcast_match_event(match_id, "bot_move", payload)
+        if match.is_active:
+            start_pondering(match_id, bot_player)
+    except Exception:
+        logger.exception("Bot move failed for match %s", match_id)
+    finally:
+        close_old_connections()
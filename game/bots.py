@@ -1,22 +1,126 @@
 # game/bots.py
-from .strategies.random import RandomBot
-from .strategies.minmax import MinMaxBot
-from .strategies.strength import AdvancedStrengthBot
-from .strategies.alphabeta import AlphaBetaBot
+"""
+Bot strategy registry.
 
+Strategy classes register themselves with @register_strategy(name); their
+modules are only imported the first time one of their names is asked for
+(see STRATEGY_MODULES), so loading this module costs nothing.
 
-def load_bot(name, **kwargs):
+load_bot() hands out one instance per strategy and configuration and per
+thread: a bot keeps its warm caches (transposition table, ...) from one
+move to the next, while the bot-move and pondering threads never share one
+mid-search, as long as an instance stays on the thread that loaded it. Configuration is layered, later wins:
+
+    depth=BOT_SEARCH_DEPTH
+    settings.BOT_STRATEGIES[name]      e.g. {"alphabeta": {"depth": 6}}
+    Player.bot_options of the bot      e.g. {"time_budget": 0.5}
+    keyword arguments to load_bot()
+
+Options the strategy's constructor does not take are dropped from the
+first three layers with a warning (they are edited by hand, in the admin
+or the environment), and rejected with ValueError as keyword arguments.
+"""
+import importlib
+import inspect
+import json
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# name -> module that registers it
+STRATEGY_MODULES = {
+    "random": "game.strategies.random",
+    "minmax": "game.strategies.minmax",
+    "strength": "game.strategies.strength",
+    "alphabeta": "game.strategies.alphabeta",
+    "solver": "game.strategies.solver",
+    "mcts": "game.strategies.mcts",
+}
+
+ALIASES = {
+    "heuristic": "strength",
+    "advanced": "strength",
+    "alpha-beta": "alphabeta",
+    "aggressive": "alphabeta",
+    "perfect": "solver",
+    "expert": "solver",
+    "montecarlo": "mcts",
+    "monte-carlo": "mcts",
+}
+
+_registry = {}   # name -> BotStrategy subclass
+_local = threading.local()
+
+
+def register_strategy(name):
+    """Class decorator: make a BotStrategy available to load_bot() as *name*."""
+    def decorator(cls):
+        _registry[name] = cls
+        cls.strategy_name = name
+        return cls
+    return decorator
+
+
+def strategy_names():
+    """Every name load_bot() knows, aliases excluded."""
+    return sorted(set(STRATEGY_MODULES) | set(_registry))
+
+
+def strategy_class(name):
+    key = name.lower()
+    key = ALIASES.get(key, key)
+    cls = _registry.get(key)
+    if cls is None and key in STRATEGY_MODULES:
+        importlib.import_module(STRATEGY_MODULES[key])
+        cls = _registry.get(key)
+    if cls is None:
+        raise ValueError(f"Unknown bot strategy '{name}'")
+    return key, cls
+
+
+def strategy_config(name, player=None):
+    """Constructor arguments for strategy *name*, played by bot *player*."""
+    config = {"depth": settings.BOT_SEARCH_DEPTH}
+    config.update(getattr(settings, "BOT_STRATEGIES", {}).get(name, {}))
+    if player is not None:
+        config.update(getattr(player, "bot_options", None) or {})
+    return config
+
+
+def load_bot(name, player=None, **kwargs):
     """
-    name: 'random' or 'minmax'
-    kwargs: e.g. depth=2
+    This thread's instance of strategy *name* ('random', 'minmax',
+    'strength', 'alphabeta', 'solver', 'mcts' or an alias), configured for
+    bot *player*; kwargs override the configuration, e.g. depth=2.
+    Raises ValueError for an unknown name or keyword argument.
     """
-    key = name.lower()
-    if key == "random":
-        return RandomBot(**kwargs)
-    if key == "minmax":
-        return MinMaxBot(**kwargs)
-    if key in ("strength", "heuristic", "advanced"):
-        return AdvancedStrengthBot(**kwargs)
-    if key in ("alphabeta", "alpha-beta", "aggressive"):
-        return AlphaBetaBot(**kwargs)
-    raise ValueError(f"Unknown bot strategy '{name}'")
+    key, cls = strategy_class(name)
+    unknown = _unknown_options(cls, kwargs)
+    if unknown:
+        raise ValueError(f"Bot strategy '{key}' takes no option {', '.join(unknown)}")
+    config = strategy_config(key, player)
+    config.update(kwargs)
+    # options come from JSON, so may be unhashable
+    cache_key = (key, json.dumps(config, sort_keys=True, default=str))
+    instances = getattr(_local, "instances", None)
+    if instances is None:
+        instances = _local.instances = {}
+    bot = instances.get(cache_key)
+    if bot is None:
+        unknown = _unknown_options(cls, config)
+        if unknown:
+            logger.warning("Ignoring options %s of bot strategy '%s'", ", ".join(unknown), key)
+            config = {k: v for k, v in config.items() if k not in unknown}
+        bot = instances[cache_key] = cls(**config)
+    return bot
+
+
+def _unknown_options(cls, options):
+    """Keys of *options* that cls() does not accept, sorted."""
+    params = inspect.signature(cls).parameters
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return []
+    return sorted(set(options) - set(params))
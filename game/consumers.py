@@ -66,9 +66,14 @@ class MatchConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data=None, bytes_data=None):
         data = json.loads(text_data)
         if data.get("type") == "move":
-            # 3) Call your DRF make_move, which handles human+bot
+            # 3) Call your DRF make_move (the bot answers later, see bot_move)
             result = await self._call_make_move(data["payload"])
 
+            # vs a bot the worker broadcasts this result itself, right
+            # before its "bot_move", so the two always arrive in order
+            if result.get("bot_pending"):
+                return
+
             # 4) Broadcast that result to the entire room
             await self.channel_layer.group_send(
                 self.group_name,
@@ -90,6 +95,10 @@ class MatchConsumer(AsyncWebsocketConsumer):
         # Send the move‐response JSON back down the websocket
         await self.send(text_data=json.dumps(event["data"]))
 
+    async def bot_move(self, event):
+        # the bot's reply, pushed by game.bot_worker
+        await self.send(text_data=json.dumps(event["data"]))
+
 
     #
     # — Helpers to call your DRF views in a sync context —
@@ -0,0 +1,9 @@
+# game/engine/__init__.py
+"""
+DB-free game engine shared by the bot strategies.
+
+Nothing imported here touches the ORM; use game.engine.loader to build a
+Board from a Match.
+"""
+from .board import Board, adjacency, NEIGHBOURS, NEIGHBOUR_MASKS, SIDES, TOP, RIGHT, BOTTOM, LEFT, OPPOSITE
+from .fliptable import FlipTable, flip_table, rebuild_flip_table, invalidate_flip_table
@@ -0,0 +1,141 @@
+# game/engine/analysis.py
+"""
+Position analysis: a score for every legal move, not just the best one.
+
+analyse() searches each move of the side to move with a full window, so
+the scores can be compared (a bot's alpha-beta only proves the best one).
+Scores are final cell differences for the side to move, exact when the
+search reached the end of the game.
+
+AnalysisCache keeps results by Board.canonical, moves stored by card
+edges in the canonical frame as in the opening book, so one search serves
+every player and spectator looking at the same position in any of its
+eight orientations. Entries expire after *ttl* seconds and the least
+recently used go first past *max_entries*; concurrent requests for a
+position being searched wait for that search instead of starting another.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from .search import INF, Search, SearchTimeout, plan_depth
+from .symmetry import INVERSE, SYMMETRIES, canonical, transform_move
+from .transposition import TranspositionTable
+
+
+def analyse(board, node_budget, deadline=None, endgame=None):
+    """
+    (depth, [(pos, k, score, captured), ...]) for every distinct move on
+    *board*, best first. *depth* is that of the deepest pass that finished
+    before *deadline*; *endgame*, an EndgameTable, answers exactly when it
+    covers the position.
+    """
+    moves = board.moves()
+    if not moves:
+        return 0, []
+    empty = board.empty_count()
+    if endgame is not None and endgame.covers(board):
+        return empty, _sorted([
+            (*mv, _child(board, mv, lambda: -endgame.solve(board))) for mv in moves
+        ])
+
+    target = plan_depth(board, node_budget)
+    search = Search(TranspositionTable(1 << 16), deadline=deadline)
+    result = None
+    for depth in range(1, target + 1):
+        search.deadline = deadline if result is not None else None
+        try:
+            rows = [
+                (*mv, _child(board, mv, lambda: -search.negamax(board, depth - 1, -INF, INF)))
+                for mv in moves
+            ]
+        except SearchTimeout:
+            break
+        result = (depth, _sorted(rows))
+    return result
+
+
+def _child(board, mv, score):
+    """(score(), captured cells) after playing *mv*."""
+    captured = board.make(*mv)
+    try:
+        return score(), list(captured)
+    finally:
+        board.unmake(*mv, captured)
+
+
+def _sorted(rows):
+    return [(pos, k, score, captured) for pos, k, (score, captured) in
+            sorted(rows, key=lambda r: r[2][0], reverse=True)]
+
+
+class AnalysisCache:
+    def __init__(self, max_entries=4096, ttl=600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()   # canonical key -> (expires, depth, rows)
+        self.pending = {}              # canonical key -> Event of the search running
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def analysis(self, board, compute):
+        """
+        (depth, rows, cached) for *board*, rows as analyse() returns them.
+        compute(board) runs the search on a miss.
+        """
+        key, sym = canonical(board.sym_hash)
+        while True:
+            with self._lock:
+                entry = self.entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    rows = self._restore(board, entry[2], sym)
+                    if rows is not None:
+                        self.entries.move_to_end(key)
+                        self.hits += 1
+                        return entry[1], rows, True
+                waiting = self.pending.get(key)
+                if waiting is None:
+                    self.misses += 1
+                    done = self.pending[key] = threading.Event()
+                    break
+            waiting.wait()
+
+        try:
+            depth, rows = compute(board)
+            stored = [
+                (*transform_move((pos, board.edges[k]), sym), score,
+                 tuple(SYMMETRIES[sym][0][n] for n in captured))
+                for pos, k, score, captured in rows
+            ]
+            with self._lock:
+                self.entries[key] = (time.monotonic() + self.ttl, depth, stored)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+        finally:
+            with self._lock:
+                del self.pending[key]
+            done.set()
+        return depth, rows, False
+
+    @staticmethod
+    def _restore(board, stored, sym):
+        """Rows of a stored entry in *board*'s frame, None if they do not fit it."""
+        back = INVERSE[sym]
+        cells = SYMMETRIES[back][0]
+        by_edges = {board.edges[k]: k for k in board.distinct_hand()}
+        rows = []
+        for pos, edges, score, captured in stored:
+            pos, edges = transform_move((pos, edges), back)
+            k = by_edges.get(edges)
+            # a 64-bit key can still collide
+            if k is None or board.owner(pos) is not None:
+                return None
+            rows.append((pos, k, score, [cells[n] for n in captured]))
+        return rows
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
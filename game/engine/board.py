@@ -0,0 +1,275 @@
+# game/engine/board.py
+"""
+Compact, DB-free board for the bot strategies.
+
+Cells are 0–8 (row-major). Every card that can show up in the match gets a
+small local index ``k``; its edges are ``edges[k] = (top, right, bottom, left)``
+and its row in the FlipTable is ``kinds[k]``. Occupancy, ownership and hands
+are bitmasks, so make()/unmake() just flip bits instead of copying the state.
+
+Seats: 0 is player_one, 1 is player_two.
+
+``hash`` is a Zobrist key of the whole position (cells, owners, hands,
+turn). ``canonical`` is the same key for the board's symmetry class: the
+smallest of the keys of its eight rotations/reflections (game.engine.symmetry).
+Both come from ``sym_hash``, which make()/unmake() keep up to date with one
+XOR per change.
+"""
+from .geometry import (  # noqa: F401  (re-exported)
+    TOP, RIGHT, BOTTOM, LEFT, SIDES, OPPOSITE, FULL,
+    adjacency, NEIGHBOURS, NEIGHBOUR_MASKS,
+)
+from .symmetry import PACKED_TURN_KEY, canonical, packed_cell_keys, packed_hand_keys
+
+_M64 = (1 << 64) - 1
+
+
+def _mask(indices):
+    m = 0
+    for k in indices:
+        m |= 1 << k
+    return m
+
+
+def _bits(mask):
+    """Indices of the set bits in *mask*, lowest first."""
+    out = []
+    k = 0
+    while mask:
+        if mask & 1:
+            out.append(k)
+        mask >>= 1
+        k += 1
+    return out
+
+
+class Board:
+    """
+    - table:    FlipTable answering every flip check
+    - kinds:    FlipTable kind per local card index
+    - edges:    (top, right, bottom, left) per local card index
+    - card_ids: external id per local card index (PlayerCard ids when loaded
+                from a match, plain indices otherwise)
+    - cells:    local card index per cell, -1 when empty
+    - occupied: bitmask of filled cells
+    - owned:    bitmask of cells owned by seat 1
+    - hands:    [seat 0 mask, seat 1 mask] over local card indices
+    - turn:     seat to move
+    - sym_hash: packed Zobrist keys of the position under all 8 symmetries
+    """
+    __slots__ = ('table', 'kinds', 'edges', 'card_ids', '_rows', '_same',
+                 '_cell_keys', '_hand_keys',
+                 'cells', 'occupied', 'owned', 'hands', 'turn', 'sym_hash')
+
+    def __init__(self, table, kinds, hands, turn=0, cells=None, card_ids=None):
+        """
+        hands: pair of iterables of local card indices still to be played
+        cells: optional {pos: (card_index, seat)} for cards already placed
+        """
+        self.table = table
+        self.kinds = tuple(kinds)
+        self.edges = tuple(table.edges[kind] for kind in self.kinds)
+        self.card_ids = tuple(card_ids) if card_ids is not None else tuple(range(len(self.kinds)))
+        # per local card and side: offset of its row in table.table
+        self._rows = tuple(
+            tuple((kind * 4 + side) * table.size for side in range(4))
+            for kind in self.kinds
+        )
+        self.cells = [-1] * 9
+        self.occupied = 0
+        self.owned = 0
+        self.hands = [_mask(hands[0]), _mask(hands[1])]
+        self.turn = turn
+        for pos, (k, seat) in (cells or {}).items():
+            self.cells[pos] = k
+            self.occupied |= 1 << pos
+            if seat:
+                self.owned |= 1 << pos
+
+        # masks of local cards sharing a kind, to count copies left in a hand
+        self._same = tuple(
+            _mask(j for j, other in enumerate(self.kinds) if other == kind)
+            for kind in self.kinds
+        )
+        seat_of = {k: seat for seat in (0, 1) for k in _bits(self.hands[seat])}
+        for pos, (k, seat) in (cells or {}).items():
+            seat_of.setdefault(k, seat)
+        self._cell_keys = tuple(packed_cell_keys(e) for e in self.edges)
+        self._hand_keys = tuple(
+            packed_hand_keys(seat_of.get(k, 0), e, self._same[k].bit_count())
+            for k, e in enumerate(self.edges)
+        )
+        self.sym_hash = self._full_hash()
+
+    @classmethod
+    def from_edges(cls, edges, hands, turn=0, cells=None, card_ids=None):
+        """Board over plain edge tuples, with a FlipTable of its own."""
+        from .fliptable import FlipTable
+
+        table = FlipTable.from_edges(edges)
+        return cls(table, [table.kind_of[k] for k in range(len(edges))],
+                   hands, turn=turn, cells=cells, card_ids=card_ids)
+
+    def pack(self):
+        """Plain tuple of the position, cheap to pickle to a worker process."""
+        return (self.table.edges, self.kinds, self.card_ids, tuple(self.cells),
+                self.owned, tuple(self.hands), self.turn)
+
+    @classmethod
+    def unpack(cls, packed):
+        """Inverse of pack(); the FlipTable is rebuilt from the kind edges."""
+        from .fliptable import FlipTable
+
+        kind_edges, kinds, card_ids, cells, owned, hands, turn = packed
+        placed = {pos: (k, owned >> pos & 1) for pos, k in enumerate(cells) if k >= 0}
+        return cls(FlipTable.from_edges(kind_edges), kinds, (_bits(hands[0]), _bits(hands[1])),
+                   turn=turn, cells=placed, card_ids=card_ids)
+
+    def _full_hash(self):
+        h = PACKED_TURN_KEY if self.turn else 0
+        for pos in _bits(self.occupied):
+            h ^= self._cell_keys[self.cells[pos]][pos * 2 + (self.owned >> pos & 1)]
+        for hand in self.hands:
+            seen = 0
+            for k in _bits(hand):
+                same = self._same[k]
+                if seen & same:
+                    continue
+                # one key per copy still held, whichever copies those are
+                seen |= same
+                for n in range(1, (hand & same).bit_count() + 1):
+                    h ^= self._hand_keys[k][n]
+        return h
+
+    # ─── Queries ─────────────────────────────────────────────────────
+
+    @property
+    def hash(self):
+        """Zobrist key of the position as it stands."""
+        return self.sym_hash & _M64
+
+    @property
+    def canonical(self):
+        """Zobrist key shared by the position and its 7 symmetric twins."""
+        return canonical(self.sym_hash)[0]
+
+    def symmetry(self):
+        """Index into SYMMETRIES that maps this board onto its canonical frame."""
+        return canonical(self.sym_hash)[1]
+
+    def owner(self, pos):
+        """Seat owning *pos*, or None when the cell is empty."""
+        if not self.occupied >> pos & 1:
+            return None
+        return self.owned >> pos & 1
+
+    def free_cells(self):
+        return _bits(~self.occupied & FULL)
+
+    def hand(self, seat=None):
+        """Local card indices still held by *seat* (defaults to the side to move)."""
+        return _bits(self.hands[self.turn if seat is None else seat])
+
+    def distinct_hand(self, seat=None):
+        """
+        hand(), keeping only the lowest index of each set of identical cards
+        (same edges): copies lead to exactly the same positions.
+        """
+        hand = self.hands[self.turn if seat is None else seat]
+        same = self._same
+        out = []
+        while hand:
+            k = (hand & -hand).bit_length() - 1
+            out.append(k)
+            hand &= ~same[k]
+        return out
+
+    def moves(self):
+        """Every distinct legal (position, card_index) for the side to move."""
+        cards = self.distinct_hand()
+        return [(pos, k) for pos in self.free_cells() for k in cards]
+
+    def is_terminal(self):
+        return self.occupied == FULL or not self.hands[self.turn]
+
+    def empty_count(self):
+        return 9 - self.occupied.bit_count()
+
+    def counts(self):
+        """(cells owned by seat 0, cells owned by seat 1)."""
+        ones = self.owned.bit_count()
+        return self.occupied.bit_count() - ones, ones
+
+    def score(self, seat):
+        """Cells owned by *seat* minus cells owned by the other seat."""
+        zero, one = self.counts()
+        return one - zero if seat else zero - one
+
+    def flips(self, pos, k):
+        """
+        Neighbor cells whose card is beaten by card *k* placed at *pos*.
+        Same rule and order as game.utils.check_flips: ownership is not
+        looked at, a beaten card of your own is listed too.
+        """
+        table = self.table.table
+        kinds = self.kinds
+        cells = self.cells
+        rows = self._rows[k]
+        out = []
+        for n, side in NEIGHBOURS[pos]:
+            c = cells[n]
+            if c >= 0 and table[rows[side] + kinds[c]]:
+                out.append(n)
+        return out
+
+    def captures(self, pos, k):
+        """How many opponent cards make(pos, k) would take."""
+        if not self.occupied & NEIGHBOUR_MASKS[pos]:
+            return 0
+        turn = self.turn
+        return sum(1 for n in self.flips(pos, k) if (self.owned >> n & 1) != turn)
+
+    # ─── Make / unmake ───────────────────────────────────────────────
+
+    def make(self, pos, k):
+        """
+        Play card *k* at *pos* for the side to move and pass the turn.
+        Returns the cells that actually changed owner; hand it back to unmake().
+        """
+        turn = self.turn
+        hand = self.hands[turn]
+        keys = self._cell_keys
+        h = self.sym_hash ^ PACKED_TURN_KEY ^ self._hand_keys[k][(hand & self._same[k]).bit_count()]
+        h ^= keys[k][pos * 2 + turn]
+        self.cells[pos] = k
+        self.occupied |= 1 << pos
+        self.hands[turn] = hand & ~(1 << k)
+        captured = []
+        for n in self.flips(pos, k):
+            if (self.owned >> n & 1) != turn:
+                self.owned ^= 1 << n
+                c = keys[self.cells[n]]
+                h ^= c[n * 2] ^ c[n * 2 + 1]
+                captured.append(n)
+        if turn:
+            self.owned |= 1 << pos
+        self.turn = turn ^ 1
+        self.sym_hash = h
+        return captured
+
+    def unmake(self, pos, k, captured):
+        """Undo make(pos, k) that returned *captured*."""
+        turn = self.turn ^ 1
+        self.turn = turn
+        keys = self._cell_keys
+        h = self.sym_hash ^ PACKED_TURN_KEY ^ keys[k][pos * 2 + turn]
+        for n in captured:
+            self.owned ^= 1 << n
+            c = keys[self.cells[n]]
+            h ^= c[n * 2] ^ c[n * 2 + 1]
+        self.owned &= ~(1 << pos)
+        self.occupied &= ~(1 << pos)
+        self.cells[pos] = -1
+        hand = self.hands[turn] | 1 << k
+        self.hands[turn] = hand
+        self.sym_hash = h ^ self._hand_keys[k][(hand & self._same[k]).bit_count()]
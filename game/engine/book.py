@@ -0,0 +1,104 @@
+# game/engine/book.py
+"""
+Opening book: precomputed best moves for early positions, read from disk.
+
+Built by ``manage.py build_opening_book``. The file is a 16-byte header
+(magic, record count) followed by fixed-size records sorted by key:
+
+    key     u64   Board.canonical of the position
+    pos     u8    cell of the move            } in the canonical frame,
+    edges   4×u8  edges of the card to play   } see game.engine.symmetry
+    score   i8    search score for the side to move
+    depth   u8    plies searched (the empty-cell count when solved)
+
+Moves are stored by edges, not by card index, so one record serves every
+match where the same cards meet, in any of the eight orientations.
+Lookups are a binary search over a read-only mmap: opening a book reads
+nothing up front and a probe touches ~log2(n) records.
+"""
+import mmap
+import os
+import struct
+
+from .symmetry import INVERSE, canonical, transform_move
+
+_MAGIC = b'ZZBOOK01'
+_HEADER = struct.Struct('<8sQ')
+_RECORD = struct.Struct('<QB4BbBx')
+
+
+class OpeningBook:
+    def __init__(self, path):
+        with open(path, 'rb') as fp:
+            self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+
+    def __len__(self):
+        return self.size
+
+    def _record(self, i):
+        return _RECORD.unpack_from(self._map, _HEADER.size + i * _RECORD.size)
+
+    def lookup(self, key):
+        """(pos, edges, score, depth) stored for canonical *key*, or None."""
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.size:
+            return None
+        rec = self._record(lo)
+        if rec[0] != key:
+            return None
+        return rec[1], tuple(rec[2:6]), rec[6], rec[7]
+
+    def probe(self, board):
+        """Book move for *board* as (position, card_index), or None."""
+        key, sym = canonical(board.sym_hash)
+        hit = self.lookup(key)
+        if hit is None:
+            return None
+        pos, edges = transform_move(hit[:2], INVERSE[sym])
+        # a 64-bit key can still collide: only play what is legal here
+        if board.owner(pos) is not None:
+            return None
+        for k in board.distinct_hand():
+            if board.edges[k] == edges:
+                return pos, k
+        return None
+
+
+def book_entry(board, move, score, depth):
+    """(key, record) for *move* = (position, card_index) found on *board*."""
+    key, sym = canonical(board.sym_hash)
+    pos, k = move
+    return key, (*transform_move((pos, board.edges[k]), sym), score, depth)
+
+
+def write_book(path, entries):
+    """
+    Write {key: (pos, edges, score, depth)} to *path*. The file is swapped
+    in whole, so a server reading the old one never sees half a book.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as fp:
+        fp.write(_HEADER.pack(_MAGIC, len(entries)))
+        for key in sorted(entries):
+            pos, edges, score, depth = entries[key]
+            fp.write(_RECORD.pack(key, pos, *edges, score, depth))
+    os.replace(tmp, path)
+
+
+def read_book(path):
+    """All entries of the book at *path*, in write_book()'s format."""
+    book = OpeningBook(path)
+    entries = {}
+    for i in range(len(book)):
+        key, pos, *rest = book._record(i)
+        entries[key] = (pos, tuple(rest[:4]), rest[4], rest[5])
+    return entries
@@ -0,0 +1,103 @@
+# game/engine/endgame.py
+"""
+Endgame tablebase: exact results once only a few cells are left.
+
+A placed card that no longer touches an empty cell can never flip again,
+so only its owner still matters. Entries are therefore keyed by the live
+part of the position, from the side to move's point of view:
+
+  - the empty cells
+  - every placed card next to one: (cell, edges, owned by the side to move?)
+  - the edges left in both hands, sorted
+
+and hold the exact final score of the live cells. The frozen cells are
+added back on lookup, so one entry serves every match that reaches the
+same ending, whoever sits where. The table fills lazily and drops the
+least recently used entries past *max_entries*.
+"""
+import threading
+from collections import OrderedDict
+
+from .board import _bits
+from .geometry import FULL, NEIGHBOUR_MASKS
+
+
+class EndgameTable:
+    def __init__(self, max_cells=3, max_entries=1 << 17):
+        self.max_cells = max_cells
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+        # shared by the bot worker and pondering threads
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def covers(self, board):
+        return board.empty_count() <= self.max_cells
+
+    def _key(self, board):
+        """(key, frozen): frozen is the side to move's lead on the dead cells."""
+        turn = board.turn
+        empty = ~board.occupied & FULL
+        live = 0
+        for pos in _bits(empty):
+            live |= NEIGHBOUR_MASKS[pos]
+        live &= board.occupied
+        cells = board.cells
+        edges = board.edges
+        placed = tuple(
+            (pos, edges[cells[pos]], (board.owned >> pos & 1) == turn)
+            for pos in _bits(live)
+        )
+        key = (
+            empty,
+            placed,
+            tuple(sorted(edges[k] for k in _bits(board.hands[turn]))),
+            tuple(sorted(edges[k] for k in _bits(board.hands[turn ^ 1]))),
+        )
+        dead = board.occupied & ~live
+        theirs = (board.owned if turn == 0 else ~board.owned) & dead
+        frozen = dead.bit_count() - 2 * theirs.bit_count()
+        return key, frozen
+
+    def solve(self, board):
+        """Exact final score for the side to move (board.score at the end of perfect play)."""
+        if board.is_terminal():
+            return board.score(board.turn)
+        key, frozen = self._key(board)
+        with self._lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value + frozen
+            self.misses += 1
+        value = max(self._child(board, mv) for mv in board.moves()) - frozen
+        with self._lock:
+            self.entries[key] = value
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value + frozen
+
+    def best_move(self, board):
+        """(score, move) under perfect play, move None on a finished board."""
+        best, best_move = None, None
+        for mv in board.moves():
+            score = self._child(board, mv)
+            if best is None or score > best:
+                best, best_move = score, mv
+        if best_move is None:
+            return board.score(board.turn), None
+        return best, best_move
+
+    def _child(self, board, mv):
+        captured = board.make(*mv)
+        try:
+            return -self.solve(board)
+        finally:
+            board.unmake(*mv, captured)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
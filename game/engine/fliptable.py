@@ -0,0 +1,114 @@
+# game/engine/fliptable.py
+"""
+Precomputed pairwise flip answers for a card catalog.
+
+Cards with identical edges share one "kind". For kinds a, b and a side d,
+``table[(a*4 + d)*size + b]`` is 1 when kind a, placed with side d facing
+kind b, flips it (a[d] > b[opposite d]) — the same rule as check_flips.
+"""
+import threading
+import time
+
+from .board import OPPOSITE
+
+
+class FlipTable:
+    __slots__ = ('edges', 'kind_of', 'size', 'table')
+
+    def __init__(self, cards):
+        """
+        cards: iterable of (card_id, (top, right, bottom, left))
+        """
+        self.edges = []      # kind -> edges
+        self.kind_of = {}    # card_id -> kind
+        by_edges = {}
+        for card_id, edges in cards:
+            edges = tuple(edges)
+            kind = by_edges.get(edges)
+            if kind is None:
+                kind = by_edges[edges] = len(self.edges)
+                self.edges.append(edges)
+            self.kind_of[card_id] = kind
+
+        n = self.size = len(self.edges)
+        table = bytearray(n * 4 * n)
+        for a, ea in enumerate(self.edges):
+            for side in range(4):
+                row = (a * 4 + side) * n
+                mine = ea[side]
+                for b, eb in enumerate(self.edges):
+                    if mine > eb[OPPOSITE[side]]:
+                        table[row + b] = 1
+        self.table = bytes(table)
+
+    @classmethod
+    def from_edges(cls, edges):
+        """Table for a plain list of edge tuples, keyed by list index."""
+        return cls(enumerate(edges))
+
+    def __contains__(self, card_id):
+        return card_id in self.kind_of
+
+    def beats(self, a, side, b):
+        """Does kind *a* with *side* facing kind *b* flip it?"""
+        return self.table[(a * 4 + side) * self.size + b] == 1
+
+
+# ─── Process-wide table for the Card catalog ─────────────────────────
+#
+# Each process builds its own. Card edits made elsewhere (seed_cards, the
+# admin of another worker) only reach this one through the Card rows: at
+# most every settings.FLIP_TABLE_RECHECK seconds flip_table() reads them
+# again and rebuilds when they differ from what the table was built from.
+
+_catalog_table = None
+_catalog_rows = None     # hash of the Card rows it was built from
+_checked_at = 0.0        # time.monotonic() of the last comparison
+_lock = threading.Lock()
+
+
+def _card_rows():
+    from game.models import Card
+
+    return tuple(Card.objects.order_by('id').values_list(
+        'id', 'strength_top', 'strength_right', 'strength_bottom', 'strength_left'
+    ))
+
+
+def rebuild_flip_table(rows=None):
+    """(Re)build the catalog table from the Card rows."""
+    global _catalog_table, _catalog_rows, _checked_at
+    if rows is None:
+        rows = _card_rows()
+    table = FlipTable((row[0], row[1:]) for row in rows)
+    with _lock:
+        _catalog_table, _catalog_rows, _checked_at = table, hash(rows), time.monotonic()
+    return table
+
+
+def invalidate_flip_table():
+    """Drop the catalog table; the next flip_table() call rebuilds it."""
+    global _catalog_table
+    with _lock:
+        _catalog_table = None
+
+
+def flip_table(card_ids=()):
+    """
+    The catalog FlipTable, built on first use.
+    Rebuilt once if any of *card_ids* (Card ids) is missing from it, or
+    when the Card rows changed since (checked every FLIP_TABLE_RECHECK s).
+    """
+    from django.conf import settings
+
+    global _checked_at
+    table = _catalog_table
+    if table is None or any(cid not in table for cid in card_ids):
+        return rebuild_flip_table()
+    recheck = getattr(settings, "FLIP_TABLE_RECHECK", 2.0)
+    if time.monotonic() - _checked_at >= recheck:
+        rows = _card_rows()
+        if hash(rows) != _catalog_rows:
+            return rebuild_flip_table(rows)
+        _checked_at = time.monotonic()
+    return table
@@ -0,0 +1,30 @@
+# game/engine/geometry.py
+"""Cells, sides and neighbors of the 3x3 board (cells 0–8, row-major)."""
+
+TOP, RIGHT, BOTTOM, LEFT = range(4)
+SIDES = ('top', 'right', 'bottom', 'left')
+OPPOSITE = (BOTTOM, LEFT, TOP, RIGHT)
+
+FULL = 0x1FF  # all nine cells occupied
+
+# adjacency map: for each cell index, which neighbors to compare
+adjacency = {
+    0: {'right': 1, 'bottom': 3},
+    1: {'left': 0, 'right': 2, 'bottom': 4},
+    2: {'left': 1, 'bottom': 5},
+    3: {'top': 0, 'right': 4, 'bottom': 6},
+    4: {'top': 1, 'left': 3, 'right': 5, 'bottom': 7},
+    5: {'top': 2, 'left': 4, 'bottom': 8},
+    6: {'top': 3, 'right': 7},
+    7: {'top': 4, 'left': 6, 'right': 8},
+    8: {'top': 5, 'left': 7},
+}
+
+# cell -> ((neighbor, side index), ...) in the same order as `adjacency`
+NEIGHBOURS = tuple(
+    tuple((n, SIDES.index(side)) for side, n in adjacency[pos].items())
+    for pos in range(9)
+)
+
+# cell -> bitmask of its neighbor cells
+NEIGHBOUR_MASKS = tuple(sum(1 << n for n, _ in NEIGHBOURS[pos]) for pos in range(9))
@@ -0,0 +1,88 @@
+# game/engine/loader.py
+from dataclasses import dataclass
+
+from django.db.models import Q
+
+from game.board_state import load_state
+from game.models import PlayerCard
+from .board import Board
+from .fliptable import FlipTable, flip_table
+
+
+@dataclass(frozen=True)
+class MatchSnapshot:
+    """
+    A match as the bots see it, read once and never changed.
+
+    cards[k] is the PlayerCard behind local card index k (played cards and
+    both battle decks, with their Card rows loaded), so a chosen
+    (position, k) maps straight back to a DB move. Every board() call
+    builds a fresh Board from it, so strategies can make/unmake freely.
+    """
+    match_id: int
+    version: int               # board_state version it was read at
+    player_ids: tuple          # (player_one_id, player_two_id)
+    cards: tuple               # PlayerCard per local index
+    hands: tuple               # (seat 0 indices, seat 1 indices)
+    cells: tuple               # ((position, index, seat), ...)
+    table: FlipTable
+
+    def seat(self, player_id):
+        return 1 if player_id == self.player_ids[1] else 0
+
+    def board(self, current_player_id):
+        """Fresh Board with *current_player_id* to move."""
+        return Board(
+            self.table,
+            [self.table.kind_of[pc.card_id] for pc in self.cards],
+            self.hands,
+            turn=self.seat(current_player_id),
+            cells={pos: (k, seat) for pos, k, seat in self.cells},
+            card_ids=[pc.id for pc in self.cards],
+        )
+
+
+def load_snapshot(match):
+    """
+    One query: the cards on match.board_state and both battle decks,
+    Card rows joined in.
+    """
+    player_ids = (match.player_one_id, match.player_two_id)
+    seats = {player_ids[0]: 0, player_ids[1]: 1}
+    state = load_state(match)
+    on_board = [(pos, cell) for pos, cell in enumerate(state["cells"]) if cell is not None]
+    played = {cell[1] for _, cell in on_board}
+    rows = PlayerCard.objects.filter(
+        Q(owner_id__in=seats.keys(), in_battle_deck=True) | Q(id__in=played)
+    ).select_related('card').order_by('id')
+
+    # played cards first, in board order, then the hands
+    by_id = {pc.id: pc for pc in rows}
+    cards = [by_id[cell[1]] for _, cell in on_board]
+    cards += [pc for pc in rows if pc.id not in played]
+    index = {pc.id: k for k, pc in enumerate(cards)}
+    hands = ([], [])
+    for pc in cards:
+        if pc.id not in played and pc.owner_id in seats:
+            hands[seats[pc.owner_id]].append(index[pc.id])
+
+    return MatchSnapshot(
+        match_id=match.id,
+        version=state["version"],
+        player_ids=player_ids,
+        cards=tuple(cards),
+        hands=(tuple(hands[0]), tuple(hands[1])),
+        cells=tuple((pos, index[cell[1]], seats.get(cell[0], 0)) for pos, cell in on_board),
+        table=flip_table([pc.card_id for pc in cards]),
+    )
+
+
+def load_board(match, current_player_id):
+    """
+    Snapshot *match* into a Board with ``current_player_id`` to move.
+
+    Returns (board, cards): cards[k] is the PlayerCard behind local index k,
+    so a chosen (position, k) maps straight back to a DB move.
+    """
+    snapshot = load_snapshot(match)
+    return snapshot.board(current_player_id), list(snapshot.cards)
@@ -0,0 +1,158 @@
+# game/engine/parallel.py
+"""
+Root-parallel search on a persistent process pool.
+
+The root moves are dealt round-robin (best-looking first) to the workers.
+Each worker deepens over its own slice and gets nothing but Board.pack()
+tuples, never ORM objects. Workers share their best root score per depth
+through a small shared-memory array, so a slice can search with the alpha
+another worker already proved instead of from -INF.
+
+This module is importable without Django: the pool settings are passed in
+by the caller (see game.strategies.base.parallel_workers).
+"""
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .board import Board
+from .search import INF, Search, SearchTimeout
+from .transposition import TranspositionTable
+
+# concurrent parallel searches the shared alpha array has room for
+_SLOTS = 64
+# one alpha per depth (0..9) per slot
+_DEPTHS = 10
+
+_pool = None
+_pool_lock = threading.Lock()
+_alphas = None
+_next_slot = itertools.count()
+
+# ─── Worker side ─────────────────────────────────────────────────────
+
+_worker_alphas = None
+_worker_tt = None
+
+
+def _init_worker(alphas):
+    global _worker_alphas, _worker_tt
+    _worker_alphas = alphas
+    _worker_tt = TranspositionTable(1 << 16)
+
+
+def _shared_alpha(slot, depth):
+    return _worker_alphas[slot * _DEPTHS + depth]
+
+
+def _raise_alpha(slot, depth, score):
+    i = slot * _DEPTHS + depth
+    with _worker_alphas.get_lock():
+        if score > _worker_alphas[i]:
+            _worker_alphas[i] = score
+
+
+def _search_slice(packed, moves, max_depth, deadline, slot, use_tt):
+    """
+    Deepen over *moves* only. Returns ({depth: (score, move, exact)}, nodes, cutoffs);
+    exact is False when every move of the slice failed low against the
+    shared alpha, i.e. another worker already holds a move at least as good.
+    """
+    board = Board.unpack(packed)
+    tt = _worker_tt if use_tt else None
+    if tt is not None:
+        tt.new_search()
+    # wall clock across processes, monotonic inside this one
+    search = Search(tt, deadline=time.monotonic() + (deadline - time.time()))
+    results = {}
+    order = list(moves)
+    for depth in range(1, max_depth + 1):
+        best, best_move, exact = -INF, order[0], False
+        try:
+            for mv in order:
+                # our own best is already in the shared slot
+                alpha = _shared_alpha(slot, depth)
+                captured = board.make(*mv)
+                try:
+                    score = -search.negamax(board, depth - 1, -INF, -alpha, 1)
+                finally:
+                    board.unmake(*mv, captured)
+                if score > alpha:
+                    best, best_move, exact = score, mv, True
+                    _raise_alpha(slot, depth, score)
+        except SearchTimeout:
+            break
+        results[depth] = (best, best_move, exact)
+        order.remove(best_move)
+        order.insert(0, best_move)
+    return results, search.nodes, search.cutoffs
+
+
+# ─── Caller side ─────────────────────────────────────────────────────
+
+def get_pool(workers):
+    """The process-wide pool, started on first use."""
+    global _pool, _alphas
+    with _pool_lock:
+        if _pool is None:
+            # spawn: never fork a process that holds DB connections and threads
+            ctx = multiprocessing.get_context('spawn')
+            _alphas = ctx.Array('i', _SLOTS * _DEPTHS)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=ctx,
+                initializer=_init_worker, initargs=(_alphas,),
+            )
+        return _pool
+
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+def parallel_search(board, max_depth, time_budget, workers, use_tt=True):
+    """
+    Root-split iterative deepening over *workers* processes.
+    Returns (score, move, depth) like Search.iterate(), or None when the
+    pool did not answer in time and the caller should search locally.
+    """
+    moves = board.moves()
+    max_depth = min(max_depth, board.empty_count())
+    if len(moves) < 2 or max_depth < 2:
+        return None
+    moves.sort(key=lambda mv: board.captures(*mv), reverse=True)
+    slices = [moves[i::workers] for i in range(workers)]
+    slices = [s for s in slices if s]
+
+    pool = get_pool(workers)
+    slot = next(_next_slot) % _SLOTS
+    with _alphas.get_lock():
+        for depth in range(_DEPTHS):
+            _alphas[slot * _DEPTHS + depth] = -INF
+
+    deadline = time.time() + time_budget
+    packed = board.pack()
+    futures = [
+        pool.submit(_search_slice, packed, s, max_depth, deadline, slot, use_tt)
+        for s in slices
+    ]
+    # a little slack for pickling and process wake-up; stragglers are not
+    # cancelled, they stop on their own at the same deadline
+    done, pending = wait(futures, timeout=time_budget + 0.25)
+    if pending:
+        return None
+
+    results = [f.result()[0] for f in futures]
+    depth = min(max(r) if r else 0 for r in results)
+    if depth == 0:
+        return None
+    candidates = [r[depth] for r in results if r[depth][2]]
+    if not candidates:
+        return None
+    score, move, _ = max(candidates, key=lambda c: c[0])
+    return score, move, depth
@@ -0,0 +1,229 @@
+# game/engine/search.py
+"""
+Negamax alpha-beta over an engine Board.
+
+Scores are always from the side to move: cells it owns minus cells the
+opponent owns. A depth larger than the number of empty cells is the same
+search as a full solve, so depths are clamped to it before they are stored.
+
+With a ``deadline`` (time.monotonic() value) the search raises SearchTimeout
+once it is passed, and so it does once an ``abort`` Event is set (game.ponder
+stops its searches that way); the board is always unwound back to where it
+started.
+iterate() turns that into iterative deepening: it returns the result of the
+deepest iteration that finished in time.
+
+The transposition table is keyed by Board.canonical, one entry for a
+position and all its rotations/reflections; its move is only reused on the
+exact frame it was found on (see game.engine.transposition).
+
+Move ordering, best first:
+  1. the transposition-table move (or the previous iteration's best at the root)
+  2. moves by number of opponent cards they capture
+  3. killer moves that cut off at the same ply, then the history heuristic
+
+plan_depth() picks the depth for a node budget instead of a fixed one:
+shallow while the tree is wide, a full solve once the rest of the game fits.
+"""
+import time
+
+from .transposition import EXACT, LOWER, UPPER
+
+INF = 100
+
+# nodes between two clock reads
+_CLOCK_EVERY = 1024
+
+# ordering weights: a capture outranks any killer/history bonus
+_CAPTURE = 1 << 20
+_KILLER = 1 << 16
+
+
+# nodes searched ~ (full-width tree size) ** this, for this move ordering:
+# measured 0.60-0.70 from depth 3 on, lowest for the deepest searches
+_EFFECTIVE_EXPONENT = 0.66
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def estimate_nodes(board, depth):
+    """Rough node count of an iterative-deepening search to *depth* on *board*."""
+    empty = board.empty_count()
+    hands = (len(board.distinct_hand(0)), len(board.distinct_hand(1)))
+    width = total = 1
+    for ply in range(min(depth, empty)):
+        # each side has played ply // 2 cards since the root
+        width *= (empty - ply) * max(1, hands[board.turn ^ (ply & 1)] - ply // 2)
+        total += width
+    return total ** _EFFECTIVE_EXPONENT
+
+
+def plan_depth(board, node_budget):
+    """
+    Deepest depth whose estimated search fits in *node_budget* nodes, at
+    least 1; the empty-cell count, i.e. an exact solve, when the whole rest
+    of the game fits.
+    """
+    empty = board.empty_count()
+    depth = 1
+    while depth < empty and estimate_nodes(board, depth + 1) <= node_budget:
+        depth += 1
+    return depth
+
+
+class Search:
+    def __init__(self, tt=None, deadline=None, abort=None):
+        self.tt = tt
+        self.deadline = deadline
+        self.abort = abort
+        self.nodes = 0
+        self.cutoffs = 0
+        self.depth_reached = 0
+        self.killers = {}   # ply -> [move, move]
+        self.history = {}   # move -> weight
+
+    def iterate(self, board, max_depth):
+        """
+        Iterative deepening up to *max_depth*.
+        Returns (score, move, depth) of the deepest finished iteration;
+        depth 1 always runs to completion, deadline or not, unless aborted
+        (move is then None).
+        """
+        max_depth = min(max_depth, board.empty_count())
+        deadline = self.deadline
+        result = (board.score(board.turn), None, 0)
+        best = None
+        for depth in range(1, max_depth + 1):
+            self.deadline = deadline if depth > 1 else None
+            try:
+                score, move = self.run(board, depth, first=best)
+            except SearchTimeout:
+                break
+            finally:
+                self.deadline = deadline
+            best = move
+            result = (score, move, depth)
+            self.depth_reached = depth
+        return result
+
+    def run(self, board, depth, first=None):
+        """
+        Best (score, move) for the side to move at a fixed depth;
+        move is None on a finished board. *first* is searched before the rest.
+        """
+        self.nodes += 1
+        best, best_move = -INF, None
+        alpha, beta = -INF, INF
+        depth = min(depth, board.empty_count())
+        hint = first if first is not None else self._hint(board)
+        for mv in self._ordered(board, hint, 0, depth):
+            captured = board.make(*mv)
+            try:
+                score = -self.negamax(board, depth - 1, -beta, -alpha, 1)
+            finally:
+                board.unmake(*mv, captured)
+            if score > best:
+                best, best_move = score, mv
+            alpha = max(alpha, best)
+        if best_move is None:
+            return board.score(board.turn), None
+        if self.tt is not None:
+            self.tt.store(board.canonical, depth, EXACT, best, best_move, board.hash)
+        self.depth_reached = max(self.depth_reached, depth)
+        return best, best_move
+
+    def negamax(self, board, depth, alpha, beta, ply=1):
+        self.nodes += 1
+        if not self.nodes % _CLOCK_EVERY and (
+            (self.deadline is not None and time.monotonic() > self.deadline)
+            or (self.abort is not None and self.abort.is_set())
+        ):
+            raise SearchTimeout
+        if depth <= 0 or board.is_terminal():
+            return board.score(board.turn)
+        depth = min(depth, board.empty_count())
+
+        alpha_orig = alpha
+        hint = None
+        tt = self.tt
+        if tt is not None:
+            key = board.canonical
+            entry = tt.probe(key)
+            if entry is not None:
+                _, e_depth, flag, value, hint, _, frame = entry
+                if frame != board.hash:
+                    hint = None
+                if e_depth >= depth:
+                    if flag == EXACT:
+                        return value
+                    if flag == LOWER:
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        return value
+
+        best, best_move = -INF, None
+        for mv in self._ordered(board, hint, ply, depth):
+            captured = board.make(*mv)
+            try:
+                score = -self.negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake(*mv, captured)
+            if score > best:
+                best, best_move = score, mv
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        self.cutoffs += 1
+                        self._remember_cutoff(mv, ply, depth)
+                        break
+
+        if tt is not None:
+            if best <= alpha_orig:
+                flag = UPPER
+            elif best >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt.store(key, depth, flag, best, best_move, board.hash)
+        return best
+
+    def _remember_cutoff(self, mv, ply, depth):
+        killers = self.killers.setdefault(ply, [])
+        if mv not in killers:
+            killers.insert(0, mv)
+            del killers[2:]
+        self.history[mv] = min(self.history.get(mv, 0) + depth * depth, _KILLER - 1)
+
+    def _hint(self, board):
+        if self.tt is None:
+            return None
+        entry = self.tt.probe(board.canonical)
+        if entry is None or entry[6] != board.hash:
+            return None
+        return entry[4]
+
+    def _ordered(self, board, hint, ply, depth):
+        moves = board.moves()
+        if len(moves) < 2:
+            return moves
+        # right above the leaves the sort costs about what it saves
+        if depth > 1:
+            killers = self.killers.get(ply, ())
+            history = self.history
+            captures = board.captures
+            weight = {}
+            for mv in moves:
+                w = captures(*mv) * _CAPTURE + history.get(mv, 0)
+                if mv in killers:
+                    w += _KILLER
+                weight[mv] = w
+            moves.sort(key=weight.__getitem__, reverse=True)
+        # the stored move may come from another match; only trust it if legal here
+        if hint is not None and hint in moves:
+            moves.remove(hint)
+            moves.insert(0, hint)
+        return moves
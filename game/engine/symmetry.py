@@ -0,0 +1,117 @@
+# game/engine/symmetry.py
+"""
+The eight symmetries of the 3x3 board (four rotations, each optionally
+mirrored) and Zobrist keys that cover all of them at once.
+
+A symmetry moves cells *and* turns the cards with them: a card's top edge
+ends up on whichever side the board's top went to. Positions that map onto
+each other play out identically, so caches can keep one entry for the lot.
+
+Each symmetry is (cells, sides): cells[pos] is where *pos* goes, sides[s]
+is where side *s* goes. Both are checked against the adjacency map at import.
+
+Packed keys hold the Zobrist key of the position as seen through every
+symmetry, 64 bits apiece, symmetry i at bits 64*i. Frame 0 is the identity,
+i.e. the plain key; XOR-ing packed keys updates all eight frames at once.
+"""
+from .geometry import OPPOSITE, SIDES, adjacency
+from .zobrist import zobrist_key
+
+_M64 = (1 << 64) - 1
+
+# (r, c) -> (c, 2 - r): a quarter turn clockwise; top goes to the right
+_ROTATE = (tuple(3 * (p % 3) + 2 - p // 3 for p in range(9)), (1, 2, 3, 0))
+# (r, c) -> (r, 2 - c): mirror left to right; top and bottom stay put
+_MIRROR = (tuple(3 * (p // 3) + 2 - p % 3 for p in range(9)), (0, 3, 2, 1))
+_IDENTITY = (tuple(range(9)), (0, 1, 2, 3))
+
+
+def _compose(f, g):
+    """f after g."""
+    return tuple(f[0][x] for x in g[0]), tuple(f[1][s] for s in g[1])
+
+
+def _symmetries():
+    out = []
+    turn = _IDENTITY
+    for _ in range(4):
+        out.append(turn)
+        out.append(_compose(_MIRROR, turn))
+        turn = _compose(_ROTATE, turn)
+    return tuple(out)
+
+
+SYMMETRIES = _symmetries()
+
+# INVERSE[i] undoes SYMMETRIES[i]
+INVERSE = tuple(
+    next(j for j, g in enumerate(SYMMETRIES) if _compose(g, f) == _IDENTITY)
+    for f in SYMMETRIES
+)
+
+
+def _check():
+    assert len(set(SYMMETRIES)) == 8
+    for cells, sides in SYMMETRIES:
+        for pos, links in adjacency.items():
+            for side, n in links.items():
+                s = SIDES.index(side)
+                # neighbors stay neighbors, across the matching side
+                assert adjacency[cells[pos]][SIDES[sides[s]]] == cells[n]
+                assert sides[OPPOSITE[s]] == OPPOSITE[sides[s]]
+
+
+_check()
+
+
+def transform_edges(edges, i):
+    """(top, right, bottom, left) of a card after symmetry *i*."""
+    sides = SYMMETRIES[i][1]
+    out = [0] * 4
+    for s, value in enumerate(edges):
+        out[sides[s]] = value
+    return tuple(out)
+
+
+def transform_move(move, i):
+    """(position, edges) of a move after symmetry *i*."""
+    pos, edges = move
+    return SYMMETRIES[i][0][pos], transform_edges(edges, i)
+
+
+def _packed(parts_of):
+    key = 0
+    for i in range(8):
+        key |= zobrist_key(*parts_of(i)) << (64 * i)
+    return key
+
+
+PACKED_TURN_KEY = _packed(lambda i: ('turn',))
+
+
+def packed_cell_keys(edges):
+    """Packed keys for a card at every (pos, seat), laid out as pos*2 + seat."""
+    return tuple(
+        _packed(lambda i: ('cell', SYMMETRIES[i][0][pos], transform_edges(edges, i), seat))
+        for pos in range(9) for seat in (0, 1)
+    )
+
+
+def packed_hand_keys(seat, edges, copies=7):
+    """Packed keys indexed by copy count: [0, key(1), key(2), ...]."""
+    return (0,) + tuple(
+        _packed(lambda i: ('hand', seat, transform_edges(edges, i), n))
+        for n in range(1, copies + 1)
+    )
+
+
+def frames(packed):
+    """The eight 64-bit keys in a packed key."""
+    return [packed >> (64 * i) & _M64 for i in range(8)]
+
+
+def canonical(packed):
+    """(key, symmetry): the smallest frame and the symmetry that gives it."""
+    keys = frames(packed)
+    key = min(keys)
+    return key, keys.index(key)
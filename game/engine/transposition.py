@@ -0,0 +1,59 @@
+# game/engine/transposition.py
+"""
+Bounded transposition table for the search bots.
+
+One entry per slot, slot = key & mask. Entries are tuples
+(key, depth, flag, value, move, generation, frame) where flag says whether
+*value* is exact or only a lower/upper bound found at *depth*.
+
+The search keys entries by Board.canonical, so a position and its
+rotations/reflections share one entry. Values carry over between them,
+moves do not: *frame* is the Board.hash the move was found on, and the
+move is only a valid hint for a board with that same hash.
+
+Replacement: an entry left over from an older search is always replaced;
+within the current search the deeper entry wins, ties go to the newcomer.
+"""
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class TranspositionTable:
+    def __init__(self, size=1 << 16):
+        # round up to a power of two so the slot is a mask, not a modulo
+        size = 1 << max(0, size - 1).bit_length()
+        self.mask = size - 1
+        self.slots = [None] * size
+        self.generation = 0
+        self.hits = self.misses = self.stores = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def new_search(self):
+        """Age existing entries and reset the per-decision counters."""
+        self.generation += 1
+        self.hits = self.misses = self.stores = 0
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+        self.new_search()
+
+    def probe(self, key):
+        """Entry tuple for *key*, or None."""
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, flag, value, move, frame=None):
+        i = key & self.mask
+        old = self.slots[i]
+        if old is None or old[0] == key or old[5] != self.generation or depth >= old[1]:
+            self.slots[i] = (key, depth, flag, value, move, self.generation, frame)
+            self.stores += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "stores": self.stores, "size": len(self.slots)}
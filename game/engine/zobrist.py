@@ -0,0 +1,23 @@
+# game/engine/zobrist.py
+"""
+Zobrist keys for engine positions.
+
+Keys are derived from card edges rather than from ids or table rows, so the
+same position hashes the same in every match and every process:
+
+- ('cell', pos, edges, seat)  card with *edges* at *pos*, owned by *seat*
+- ('hand', seat, edges, n)    *seat* holds at least n cards with *edges*
+- ('turn',)                   seat 1 to move
+
+game.engine.symmetry packs them for all eight board symmetries at once.
+"""
+import hashlib
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def zobrist_key(*parts):
+    """Stable 64-bit key for *parts*."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
@@ -37,3 +37,11 @@ def broadcast_match_joined(match):
             }
         }
     )
+
+
+def broadcast_match_event(match_id, event_type, data):
+    """Push *data* to everyone on the match's socket (see MatchConsumer)."""
+    async_to_sync(get_channel_layer().group_send)(
+        f"match_{match_id}",
+        {"type": event_type, "data": data}
+    )
@@ -0,0 +1,205 @@
+# game/management/commands/bot_tournament.py
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# ─── Worker side (spawned processes, plain data only) ───────────────
+# workers import this module before Django is set up: no model imports
+# at module level
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _play_pair(task):
+    """
+    Play the same deal twice, each strategy moving first once.
+    Returns [(first, second, score_for_first), ...] and {strategy: [seconds, ...]}.
+    """
+    from game.bots import load_bot
+    from game.engine import Board
+
+    a, b, deal, opts = task
+    games, latency = [], {a: [], b: []}
+    for first, second in ((a, b), (b, a)):
+        names = (first, second)
+        bots = [load_bot(name, **opts) for name in names]
+        board = Board.from_edges(deal, (range(7), range(7, 14)))
+        while not board.is_terminal():
+            seat = board.turn
+            started = time.perf_counter()
+            move = bots[seat].select_move(board)
+            latency[names[seat]].append(time.perf_counter() - started)
+            if move is None:
+                break
+            board.make(*move)
+        games.append((first, second, board.score(0)))
+    return games, latency
+
+
+# ─── Reporting helpers ───────────────────────────────────────────────
+
+def wilson(successes, n, z=1.96):
+    """95% Wilson score interval for a rate of successes/n."""
+    if not n:
+        return 0.0, 0.0
+    p = successes / n
+    centre = p + z * z / (2 * n)
+    spread = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+    denom = 1 + z * z / n
+    return (centre - spread) / denom, (centre + spread) / denom
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = "Play bot strategies against each other in memory and report strength and speed"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strategies', default='random,strength,minmax,alphabeta',
+                            help="Comma-separated load_bot names (default random,strength,minmax,alphabeta)")
+        parser.add_argument('--games', type=int, default=100,
+                            help="Games per pairing, half with each side moving first (default 100)")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes (default: one per CPU)")
+        parser.add_argument('--depth', type=int, default=settings.BOT_SEARCH_DEPTH,
+                            help="Fixed search depth when --node-budget is 0 (default BOT_SEARCH_DEPTH)")
+        parser.add_argument('--node-budget', type=int, default=settings.BOT_NODE_BUDGET,
+                            help="Nodes per decision the search bots plan their depth for, "
+                                 "0 for a fixed --depth (default BOT_NODE_BUDGET)")
+        parser.add_argument('--time-budget', type=float, default=settings.BOT_TIME_BUDGET,
+                            help="Seconds per decision (default BOT_TIME_BUDGET)")
+        parser.add_argument('--seed', type=int, default=None,
+                            help="Seed for the dealt decks, to replay a tournament")
+        parser.add_argument('--output', default='bot_tournament.json',
+                            help="JSON report path (default bot_tournament.json)")
+
+    def handle(self, *args, **opts):
+        from game.models import Card
+
+        names = [s.strip().lower() for s in opts['strategies'].split(',') if s.strip()]
+        if len(names) < 2:
+            raise CommandError("Need at least two strategies.")
+        catalog = [
+            (c.strength_top, c.strength_right, c.strength_bottom, c.strength_left)
+            for c in Card.objects.all()
+        ]
+        if not catalog:
+            raise CommandError("No cards found. Run seed_cards first.")
+
+        rng = random.Random(opts['seed'])
+        worker_opts = {
+            'depth': opts['depth'],
+            'node_budget': opts['node_budget'],
+            'time_budget': opts['time_budget'],
+        }
+        tasks = []
+        for a, b in itertools.combinations(names, 2):
+            for _ in range((opts['games'] + 1) // 2):
+                deal = [rng.choice(catalog) for _ in range(14)]
+                tasks.append((a, b, deal, worker_opts))
+
+        self.stdout.write(
+            f"{len(tasks) * 2} games over {opts['workers']} workers "
+            f"(node budget {opts['node_budget']}, depth {opts['depth']}, {opts['time_budget']}s per move)…"
+        )
+        started = time.monotonic()
+        # spawn, as for the search pool: no forked DB connections
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=opts['workers'], mp_context=ctx,
+                                 initializer=_init_worker) as pool:
+            results = list(pool.map(_play_pair, tasks, chunksize=max(1, len(tasks) // (opts['workers'] * 4))))
+        wall = time.monotonic() - started
+
+        report = self._report(names, results, wall, opts)
+        self._print(report)
+        with open(opts['output'], 'w', encoding='utf-8') as fp:
+            json.dump(report, fp, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"✅ Report written to {opts['output']}"))
+
+    def _report(self, names, results, wall, opts):
+        record = {name: {'wins': 0, 'draws': 0, 'losses': 0} for name in names}
+        pairs = {}
+        latency = {name: [] for name in names}
+        for games, times in results:
+            for name, values in times.items():
+                latency[name].extend(values)
+            for first, second, score in games:
+                pair = pairs.setdefault(f"{first} vs {second}", {'wins': 0, 'draws': 0, 'losses': 0})
+                if score > 0:
+                    outcome = ('wins', 'losses')
+                elif score < 0:
+                    outcome = ('losses', 'wins')
+                else:
+                    outcome = ('draws', 'draws')
+                record[first][outcome[0]] += 1
+                record[second][outcome[1]] += 1
+                pair[outcome[0]] += 1
+
+        strategies = {}
+        for name in names:
+            r = record[name]
+            games = r['wins'] + r['draws'] + r['losses']
+            low, high = wilson(r['wins'], games)
+            times = sorted(latency[name])
+            total = sum(times)
+            strategies[name] = {
+                **r,
+                'games': games,
+                'win_rate': r['wins'] / games if games else 0.0,
+                'win_rate_ci95': [low, high],
+                'decisions': len(times),
+                'moves_per_sec': len(times) / total if total else None,
+                'latency_ms': {
+                    'p50': percentile(times, 50) * 1000,
+                    'p95': percentile(times, 95) * 1000,
+                    'p99': percentile(times, 99) * 1000,
+                    'max': (times[-1] if times else 0.0) * 1000,
+                },
+            }
+        return {
+            'settings': {
+                'depth': opts['depth'],
+                'node_budget': opts['node_budget'],
+                'time_budget': opts['time_budget'],
+                'games_per_pairing': opts['games'],
+                'workers': opts['workers'],
+                'seed': opts['seed'],
+            },
+            'wall_seconds': wall,
+            'strategies': strategies,
+            # "a vs b": results of a, moving first
+            'pairings': pairs,
+        }
+
+    def _print(self, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'strategy':<12}{'W/D/L':>14}{'win rate (95% CI)':>26}{'moves/s':>10}"
+            f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        ))
+        for name, s in report['strategies'].items():
+            low, high = s['win_rate_ci95']
+            mps = f"{s['moves_per_sec']:.0f}" if s['moves_per_sec'] else '-'
+            lat = s['latency_ms']
+            self.stdout.write(
+                f"{name:<12}{s['wins']:>6}/{s['draws']}/{s['losses']:<4}"
+                f"{s['win_rate']:>10.1%} ({low:.1%}–{high:.1%})"
+                f"{mps:>10}{lat['p50']:>9.2f}{lat['p95']:>9.2f}{lat['p99']:>9.2f}"
+            )
+        self.stdout.write(f"Wall time: {report['wall_seconds']:.1f}s")
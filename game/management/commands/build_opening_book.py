@@ -0,0 +1,102 @@
+# game/management/commands/build_opening_book.py
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from game.engine import Board
+from game.engine.book import book_entry, read_book, write_book
+from game.engine.search import Search
+from game.engine.transposition import TranspositionTable
+from game.models import Card, PlayerCard
+
+
+def _edges(card):
+    return (card.strength_top, card.strength_right, card.strength_bottom, card.strength_left)
+
+
+class Command(BaseCommand):
+    help = "Search the opening positions of the most common battle decks and write the bots' opening book"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--decks', type=int, default=3,
+                            help="Most common battle decks to pair up (default 3)")
+        parser.add_argument('--plies', type=int, default=1,
+                            help="Book positions up to this many moves in (default 1)")
+        parser.add_argument('--depth', type=int, default=9,
+                            help="Search depth per position, 9 solves it (default 9)")
+        parser.add_argument('--time', type=float, default=10.0,
+                            help="Seconds per position; the deepest finished depth is kept (default 10)")
+        parser.add_argument('--output', default=settings.BOT_OPENING_BOOK,
+                            help="Book file (default settings.BOT_OPENING_BOOK)")
+        parser.add_argument('--fresh', action='store_true',
+                            help="Start over instead of adding to the existing book")
+
+    def handle(self, *args, **opts):
+        decks = self._common_decks(opts['decks'])
+        if not decks:
+            self.stderr.write("❌ No cards found. Run seed_cards first.")
+            return
+
+        entries = {}
+        if not opts['fresh'] and os.path.exists(opts['output']):
+            entries = read_book(opts['output'])
+            self.stdout.write(f"Adding to {opts['output']} ({len(entries)} positions).")
+
+        started = time.monotonic()
+        searched = 0
+        for first in decks:
+            for second in decks:
+                edges = list(first) + list(second)
+                board = Board.from_edges(edges, (range(7), range(7, 14)))
+                tt = TranspositionTable(1 << 18)
+                searched += self._walk(board, opts['plies'], opts, tt, entries, set())
+                self.stdout.write(f"Deck pair done: {len(entries)} positions so far.")
+
+        write_book(opts['output'], entries)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Opening book written to {opts['output']}: {len(entries)} positions "
+            f"({searched} searched in {time.monotonic() - started:.0f}s)."
+        ))
+
+    def _common_decks(self, limit):
+        """Edge lists of the *limit* most common 7-card battle decks, starter deck included."""
+        counts = Counter()
+        decks = {}
+        for pc in PlayerCard.objects.filter(in_battle_deck=True).select_related('card'):
+            decks.setdefault(pc.owner_id, []).append(_edges(pc.card))
+        for cards in decks.values():
+            if len(cards) == 7:
+                counts[tuple(sorted(cards))] += 1
+        # what every new player starts with (see signals.give_initial_deck)
+        starter = tuple(sorted(_edges(c) for c in Card.objects.order_by('id')[:7]))
+        if len(starter) == 7:
+            counts[starter] += 1
+        return [deck for deck, _ in counts.most_common(limit)]
+
+    def _walk(self, board, plies, opts, tt, entries, seen):
+        """Search *board* and, *plies* deep, every position reachable from it."""
+        key = board.canonical
+        if key in seen or board.is_terminal():
+            return 0
+        seen.add(key)
+        searched = 0
+        depth = min(opts['depth'], board.empty_count())
+        if entries.get(key, (0, 0, 0, -1))[3] < depth:
+            tt.new_search()
+            search = Search(tt, deadline=time.monotonic() + opts['time'])
+            score, move, reached = search.iterate(board, depth)
+            old = entries.get(key)
+            if move is not None and (old is None or old[3] < reached):
+                entries[key] = book_entry(board, move, score, reached)[1]
+            searched = 1
+        if plies > 0:
+            for mv in board.moves():
+                captured = board.make(*mv)
+                try:
+                    searched += self._walk(board, plies - 1, opts, tt, entries, seen)
+                finally:
+                    board.unmake(*mv, captured)
+        return searched
@@ -5,6 +5,7 @@ from django.core.management.base import BaseCommand
 from django.conf import settings
 
 from game.models import Card
+from game.engine.fliptable import rebuild_flip_table
 
 class Command(BaseCommand):
     help = "Load or update cards from game/deck_v2.json, including image paths"
@@ -58,3 +59,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.MIGRATE_HEADING(
             f"Seeding complete: {created_count} created, {updated_count} updated."
         ))
+
+        # Strengths may have changed: rebuild the pairwise flip table now
+        table = rebuild_flip_table()
+        self.stdout.write(f"Flip table rebuilt: {table.size} distinct cards.")
@@ -0,0 +1,160 @@
+# game/match_cache.py
+"""
+Hot match cache: the state payload of live matches, kept in memory.
+
+get_match_state (HTTP polling and the socket's first frame) is answered
+from here. An entry is filled on the first read and rewritten by the move
+pipeline after every move (write-through). Any other save of the match
+(join, forfeit, ...) drops it, see signals.evict_hot_match. Finished
+matches are not kept.
+
+Entries are keyed by match id and carry the board_state version they were
+built at. The cache is bounded by entry count and by approximate payload
+bytes, and entries idle for longer than the TTL expire.
+
+Each payload has a weak ETag (state_etag) built from the same fields the
+entries are checked against, so a poll whose If-None-Match still holds
+is answered 304 from the entry alone, or from one narrow read on a miss.
+
+The cache is per process. A deployment running several processes sets
+settings.HOT_MATCH_REVALIDATE: after that many seconds an entry is checked
+against a one-row read of the match before it is served again.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from game.models import Match
+
+
+class HotMatchCache:
+    def __init__(self, max_entries=1024, max_bytes=8 << 20, idle_ttl=300, revalidate=0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.revalidate = revalidate
+        # match id -> [data, fingerprint, size, last read, last checked]
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, match_id):
+        """(state payload, ETag) of *match_id*, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self.entries.get(match_id)
+            if entry is not None and now - entry[3] > self.idle_ttl:
+                self._drop(match_id)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            entry[3] = now
+            self.entries.move_to_end(match_id)
+            stale = self.revalidate and now - entry[4] > self.revalidate
+        if stale:
+            # another process may have moved: one narrow read to find out
+            if fingerprint_of(match_id) != entry[1]:
+                self.evict(match_id)
+                self.misses += 1
+                return None
+            entry[4] = now
+        self.hits += 1
+        return entry[0], state_etag(match_id, entry[1])
+
+    def put(self, match, data):
+        """
+        Store the state payload *data* of *match*, unless a newer version is
+        already in. Finished matches are dropped instead. Returns the ETag
+        of *data*.
+        """
+        fingerprint = _fingerprint(match)
+        etag = state_etag(match.id, fingerprint)
+        if not match.is_active:
+            self.evict(match.id)
+            return etag
+        size = len(json.dumps(data, default=str))
+        now = time.monotonic()
+        with self._lock:
+            old = self.entries.get(match.id)
+            if old is not None and (old[1][0] or 0) > (fingerprint[0] or 0):
+                return etag
+            self._drop(match.id)
+            if size > self.max_bytes:
+                return etag
+            self.entries[match.id] = [data, fingerprint, size, now, now]
+            self.bytes += size
+            while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+        return etag
+
+    def evict(self, match_id):
+        with self._lock:
+            self._drop(match_id)
+
+    def _drop(self, match_id):
+        entry = self.entries.pop(match_id, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "bytes": self.bytes}
+
+
+def _fingerprint(match):
+    """What a state payload depends on, besides the catalog and usernames."""
+    return (
+        (match.board_state or {}).get("version"),
+        match.is_active, match.current_turn_id, match.player_two_id, match.winner_id,
+    )
+
+
+def fingerprint_of(match_id):
+    """_fingerprint() of the stored match, from one narrow read; None if it is gone."""
+    row = (
+        Match.objects.filter(pk=match_id)
+        .values_list("board_state", "is_active", "current_turn_id", "player_two_id", "winner_id")
+        .first()
+    )
+    if row is None:
+        return None
+    return ((row[0] or {}).get("version"), *row[1:])
+
+
+def state_etag(match_id, fingerprint):
+    """
+    Weak ETag of a state payload: it changes with every move (board_state
+    version), turn, join and result. Weak because image URLs follow the host.
+    """
+    version, active, turn, player_two, winner = fingerprint
+    return f'W/"{match_id}.{version or 0}.{int(active)}.{turn}.{player_two}.{winner}"'
+
+
+def remember(match):
+    """Write-through: cache *match*'s state payload as it stands now."""
+    from game.views.serializers import MatchStateSerializer  # imports game.moves
+
+    hot_matches().put(match, MatchStateSerializer(match).data)
+
+
+_hot_matches = None
+
+
+def hot_matches():
+    """The process-wide HotMatchCache."""
+    global _hot_matches
+    if _hot_matches is None:
+        _hot_matches = HotMatchCache(
+            max_entries=settings.HOT_MATCH_ENTRIES,
+            max_bytes=settings.HOT_MATCH_BYTES,
+            idle_ttl=settings.HOT_MATCH_IDLE_TTL,
+            revalidate=settings.HOT_MATCH_REVALIDATE,
+        )
+    return _hot_matches
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('game', '0005_player_last_seen'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='player',
+            name='bot_options',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
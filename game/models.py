@@ -19,6 +19,8 @@ class Player(models.Model):
         choices=[('random', 'Random')],
         default='random'
     )
+    # per-bot overrides of the strategy's settings, e.g. {"depth": 6} (see game.bots)
+    bot_options = models.JSONField(default=dict, blank=True)
 
 
     def matches(self):
@@ -111,7 +113,8 @@ class Match(models.Model):
         null=True,          # ← allow empty slot
         blank=True          # ← for admin/forms
     )
-    board_state = models.JSONField(default=dict)  # e.g. {"0": null, "1": {"card_id": 5, "player_id": 2}, ...}
+    # the live board, {"version": n, "cells": [null | [owner_id, player_card_id, card_id], ...]} (see game.board_state)
+    board_state = models.JSONField(default=dict)
     is_active = models.BooleanField(default=True)
     player_one_deck = models.ManyToManyField(Card, related_name='deck_p1')
     player_two_deck = models.ManyToManyField(Card, related_name='deck_p2')
@@ -122,6 +125,7 @@ class Match(models.Model):
 
 
 class MatchMove(models.Model):
+    # append-only history: who played which card where; flips live in Match.board_state
     match = models.ForeignKey(Match, related_name='moves', on_delete=models.CASCADE)
     player = models.ForeignKey(Player, on_delete=models.CASCADE)
     card = models.ForeignKey(PlayerCard, on_delete=models.CASCADE)
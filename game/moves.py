@@ -0,0 +1,145 @@
+# game/moves.py
+"""
+The move pipeline: one card played in a match, as one transaction.
+
+    SELECT … FOR UPDATE   the match row, board_state included, so
+                          concurrent submits queue up
+    INSERT                the new move (MatchMove is append-only history)
+    UPDATE                the match, once: board_state with the card and
+                          its flips, next turn, and the result when full
+
+and, once committed, the new state payload into game.match_cache.
+
+Whoever loses a race for the same turn sees the winner's move once the
+lock is granted and gets a MoveError, so two submits can never both land.
+"""
+import copy
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from game.board_state import CELLS, cards_at, load_state, owner_counts, place
+from game.match_cache import remember
+from game.models import Match, MatchMove
+from game.ponder import cancel_pondering
+from game.utils import flips_for
+
+
+class MoveError(Exception):
+    """The move is not (or no longer) legal; str() is the reason."""
+
+
+@dataclass(frozen=True)
+class MoveResult:
+    move: MatchMove
+    flips: list           # neighbours the card beat, as game.utils.check_flips lists them
+    state: dict           # match.board_state after the move
+    named_scores: dict    # username -> cells owned
+
+
+def play_move(match, player, card, position):
+    """
+    Play PlayerCard *card* at *position* for *player* and hand the turn to
+    the opponent, finishing *match* when the board fills up. *match* is
+    updated in place. Raises MoveError without writing anything when the
+    move is illegal.
+    """
+    try:
+        position = int(position)
+    except (TypeError, ValueError):
+        raise MoveError("Invalid position")
+    if not 0 <= position < CELLS:
+        raise MoveError("Invalid position")
+    if card.owner_id != player.id or not card.in_battle_deck:
+        raise MoveError("Card not in your battle deck")
+
+    with transaction.atomic():
+        # only the match row: player_two may be a nullable join
+        locked = (
+            Match.objects.select_for_update(of=("self",))
+            .only("is_active", "is_finished", "current_turn", "winner", "board_state")
+            .get(pk=match.pk)
+        )
+        match.is_active = locked.is_active
+        match.is_finished = locked.is_finished
+        match.current_turn_id = locked.current_turn_id
+        match.winner_id = locked.winner_id
+        match.board_state = locked.board_state
+        if not match.is_active or match.current_turn_id != player.id:
+            raise MoveError("Not your turn")
+
+        # saved below with the rest of the match
+        state = copy.deepcopy(load_state(match, save=False))
+        cells = state["cells"]
+        if cells[position] is not None:
+            raise MoveError("Cell already taken")
+        if any(cell is not None and cell[1] == card.id for cell in cells):
+            raise MoveError("Card already played")
+
+        flips = flips_for(cards_at(state), position, card.card_id)
+        place(state, position, player.id, card, flips)
+        move = MatchMove.objects.create(match=match, player=player, card=card, position=position)
+
+        match.board_state = state
+        match.current_turn = match.player_two if player.id == match.player_one_id else match.player_one
+        scores = _finish_if_full(match, state)
+        match.save(update_fields=["board_state", "current_turn", "is_active", "is_finished", "winner"])
+        if not match.is_active:
+            transaction.on_commit(lambda: cancel_pondering(match.id))
+        # after evict_hot_match's eviction: the cache holds the new state
+        transaction.on_commit(lambda: remember(match))
+
+    return MoveResult(move=move, flips=flips, state=state, named_scores=scores)
+
+
+def concede(match, player):
+    """
+    End *match* with *player*'s opponent as the winner, *player* having no
+    move left. Like play_move it locks the match row first, and raises
+    MoveError without writing anything when it is not (or no longer)
+    *player*'s turn.
+    """
+    with transaction.atomic():
+        locked = (
+            Match.objects.select_for_update(of=("self",))
+            .only("is_active", "current_turn")
+            .get(pk=match.pk)
+        )
+        if not locked.is_active or locked.current_turn_id != player.id:
+            match.is_active = locked.is_active
+            match.current_turn_id = locked.current_turn_id
+            raise MoveError("Not your turn")
+        match.is_active = False
+        match.is_finished = True
+        match.winner = match.player_one if player.id == match.player_two_id else match.player_two
+        match.current_turn = None
+        match.save(update_fields=["is_active", "is_finished", "winner", "current_turn"])
+        transaction.on_commit(lambda: cancel_pondering(match.id))
+
+
+def named_scores(match, state):
+    """{username: cells owned} on board_state *state*."""
+    counts = owner_counts(state)
+    p1, p2 = match.player_one, match.player_two
+    scores = {p1.user.username: counts.get(p1.id, 0)}
+    if p2:
+        scores[p2.user.username] = counts.get(p2.id, 0)
+    return scores
+
+
+def _finish_if_full(match, state):
+    """named_scores(); a full board also ends *match*, a tie being a draw."""
+    scores = named_scores(match, state)
+    if all(cell is not None for cell in state["cells"]):
+        p1, p2 = match.player_one, match.player_two
+        p1_score = scores[p1.user.username]
+        p2_score = scores[p2.user.username] if p2 else 0
+        if p1_score > p2_score:
+            match.winner = p1
+        elif p2 and p2_score > p1_score:
+            match.winner = p2
+        else:
+            match.winner = None  # It's a draw
+        match.is_active = False
+        match.is_finished = True
+    return scores
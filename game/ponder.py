@@ -0,0 +1,145 @@
+# game/ponder.py
+"""
+Bot pondering: searching on the human's time.
+
+Once the bot has moved, the human's likeliest replies (biggest captures
+first) are played out on an in-memory board, and the bot's answer to each
+is searched and kept per match, keyed by the resulting position hash.
+When the real move reaches one of those positions, BotStrategy.choose_move
+answers from the cache without searching.
+
+stop_pondering() ends the background work but keeps the answers (the bot's
+real turn has started); cancel_pondering() also drops them (match over).
+
+The bot is loaded on the pondering thread itself, so it searches with that
+thread's instance (see game.bots.load_bot) and never with the one the
+bot-move thread is about to use.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from game.engine.loader import load_board
+from game.models import Match
+
+logger = logging.getLogger(__name__)
+
+
+class _Session:
+    __slots__ = ("stop", "answers")
+
+    def __init__(self):
+        self.stop = threading.Event()
+        self.answers = {}   # position hash -> (position, PlayerCard id)
+
+
+_sessions = {}
+_lock = threading.Lock()
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BOT_PONDER_THREADS,
+                thread_name_prefix="bot-ponder",
+            )
+        return _executor
+
+
+def start_pondering(match_id, bot_player):
+    """Search the bot's answers to the human's next move in the background."""
+    from game.bots import strategy_class   # bots -> strategies -> base -> here
+
+    if not settings.BOT_PONDER_MOVES:
+        return
+    try:
+        _, cls = strategy_class(bot_player.bot_strategy)
+    except ValueError:
+        return
+    if not cls.ponders:
+        return
+    session = _Session()
+    with _lock:
+        old = _sessions.get(match_id)
+        if old is not None:
+            old.stop.set()
+        _sessions[match_id] = session
+    _get_executor().submit(_ponder, match_id, bot_player, session)
+
+
+def stop_pondering(match_id):
+    """Stop searching for *match_id*; answers found so far stay usable."""
+    with _lock:
+        session = _sessions.get(match_id)
+    if session is not None:
+        session.stop.set()
+
+
+def cancel_pondering(match_id):
+    """Stop searching for *match_id* and forget its answers."""
+    with _lock:
+        session = _sessions.pop(match_id, None)
+    if session is not None:
+        session.stop.set()
+
+
+def pondered_move(match_id, board_hash):
+    """(position, PlayerCard id) pondered for this position, or None."""
+    with _lock:
+        session = _sessions.get(match_id)
+    if session is None:
+        return None
+    return session.answers.get(board_hash)
+
+
+def _ponder(match_id, bot_player, session):
+    from game.bots import load_bot
+
+    close_old_connections()
+    try:
+        bot = load_bot(bot_player.bot_strategy, player=bot_player)
+        match = Match.objects.get(id=match_id)
+        human_id = match.player_one_id if bot_player.id == match.player_two_id else match.player_two_id
+        board, _ = load_board(match, human_id)
+    except Exception:
+        logger.exception("Pondering could not load match %s", match_id)
+        return
+    finally:
+        # nothing below touches the database
+        close_old_connections()
+
+    replies = board.moves()
+    replies.sort(key=lambda mv: board.captures(*mv), reverse=True)
+    searched = 0
+    for mv in replies:
+        if searched >= settings.BOT_PONDER_MOVES or session.stop.is_set():
+            break
+        captured = board.make(*mv)
+        try:
+            # twin cards lead to the same position
+            if board.is_terminal() or board.hash in session.answers:
+                continue
+            # a stop also ends the search under way
+            bot.abort = session.stop
+            try:
+                answer = bot.select_move(board)
+            finally:
+                bot.abort = None
+            if session.stop.is_set():
+                break
+            searched += 1
+            if answer is not None:
+                pos, k = answer
+                session.answers[board.hash] = (pos, board.card_ids[k])
+        except Exception:
+            logger.exception("Pondering failed for match %s", match_id)
+            break
+        finally:
+            board.unmake(*mv, captured)
+    logger.info("pondered %d replies for match %s", searched, match_id)
@@ -1,9 +1,12 @@
 # game/signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 
-from game.models import Player, Card, PlayerCard
+from game.models import Player, Card, PlayerCard, Match
+from game.engine.fliptable import invalidate_flip_table
+from game.match_cache import hot_matches
 
 @receiver(post_save, sender=User)
 def create_player_for_user(sender, instance, created, **kwargs):
@@ -29,3 +32,23 @@ def give_initial_deck(sender, instance, created, **kwargs):
         if idx < 7:
             pc.in_battle_deck = True
             pc.save()
+
+
+@receiver(post_save, sender=Card)
+@receiver(post_delete, sender=Card)
+def reset_flip_table(sender, instance, **kwargs):
+    """
+    Card strengths changed (admin, seed_cards): drop the cached FlipTable
+    so the next flip check rebuilds it from the catalog.
+    """
+    invalidate_flip_table()
+
+
+@receiver(post_save, sender=Match)
+def evict_hot_match(sender, instance, **kwargs):
+    """
+    Any save of a match (join, forfeit, a move) makes its cached state
+    stale; the move pipeline puts the new one back after this runs.
+    """
+    match_id = instance.id
+    transaction.on_commit(lambda: hot_matches().evict(match_id))
@@ -45,6 +45,7 @@ export class GameController {
         this.botDelay = opts.botDelay || 500;
         this.timer = new Timer(this.timerEl, this.handleForfeit.bind(this));
         this.playerNamesById = {};
+        this.version = 0;  // moves on the board as drawn (see _applyState)
         this.init();
     }
 
@@ -75,6 +76,7 @@ export class GameController {
 
             this._updateScores(this._formatScores(init));
             this._renderFullBoard(init.board || []);
+            this.version = init.version ?? 0;
             this.updateTurn(init);
 
 if (init.forfeited || init.game_over || init.is_active === false || init.is_finished === true) {
@@ -273,31 +275,7 @@ _renderFullBoard(boardArr) {
 this.socket.onmessage = (event) => {
     if (this.gameOver) return;
     try {
-        const data = JSON.parse(event.data);
-
-        // Animate flips for player and bot
- // Always prefer authoritative board from backend
-if (data.flips) applyFlips(this.cellMap, data.flips, this.playerId);
-if (data.bot_flips) applyFlips(this.cellMap, data.bot_flips, this.playerId);
-
-// Only use _renderFullBoard if data.board is present and up-to-date
-if (data.board && data.board.length) {
-    this._renderFullBoard(data.board);
-} else {
-    // As a fallback, place moves one by one if provided
-    if (data.move) this._placeMove(data.move);
-    if (data.bot_move) this._placeMove(data.bot_move);
-}
-
-this._updateScores(data.named_scores || {});
-this.updateTurn(data);
-
-// Hide spinner
-const deckEl = document.getElementById('move-spinner');
-if (deckEl) deckEl.style.display = "none";
-
-if (data.game_over) this._handleGameOver(data.winner_id);
-
+        this._applyState(JSON.parse(event.data));
     } catch (e) {
         console.error("WS state fetch failed:", e);
     }
@@ -310,6 +288,50 @@ if (data.game_over) this._handleGameOver(data.winner_id);
         this.socket.onerror = e => console.error("WS error", e);
     }
 
+    /**
+     * A full state (has `board`) or a delta from `since` to `version`:
+     * placed cards plus flips. A delta that does not start at our version
+     * means we missed one, so catch up from the changes endpoint instead.
+     */
+    _applyState(data) {
+        if (data.board) {
+            this._renderFullBoard(data.board);
+        } else if (data.version !== undefined) {
+            if (data.version < this.version) return;  // already drawn
+            if (data.version > this.version && data.since !== this.version) {
+                this._catchUp();
+                return;
+            }
+        }
+        if (data.version !== undefined) this.version = data.version;
+
+        // In move order: a bot flip can take the card the human just placed
+        if (data.move) this._placeMove(data.move);
+        if (data.flips) applyFlips(this.cellMap, data.flips, this.playerId);
+        if (data.bot_move) this._placeMove(data.bot_move);
+        if (data.bot_flips) applyFlips(this.cellMap, data.bot_flips, this.playerId);
+        // changes endpoint: its flips are of cells placed before, in any order
+        if (data.placed) data.placed.forEach(mv => this._placeMove(mv));
+
+        this._updateScores(data.named_scores || {});
+        this.updateTurn(data);
+
+        // Hide spinner, unless the bot's reply is still on its way
+        const deckEl = document.getElementById('move-spinner');
+        if (deckEl) deckEl.style.display = data.bot_pending ? "flex" : "none";
+
+        if (data.game_over) this._handleGameOver(data.winner_id);
+    }
+
+    async _catchUp() {
+        try {
+            const data = await fetchJson(`/game/api/match/${this.matchId}/changes/?since=${this.version}`);
+            if (!this.gameOver) this._applyState(data);
+        } catch (e) {
+            console.error("Catch-up failed:", e);
+        }
+    }
+
     _handleGameOver(winnerId) {
         this.gameOver = true;
         sfx.stopBackground();
@@ -1,6 +1,22 @@
 // polling.js
 import { fetchJson } from "./utils.js";
 
+/**
+ * fetchJson for polling: sends back the last ETag seen for `url` and
+ * resolves to null on 304, i.e. when nothing changed since.
+ */
+const etags = new Map();
+
+async function fetchIfChanged(url) {
+  const headers = etags.has(url) ? { "If-None-Match": etags.get(url) } : {};
+  const r = await fetch(url, { credentials: "same-origin", cache: "no-store", headers });
+  if (r.status === 304) return null;
+  if (!r.ok) return r.text().then(t => Promise.reject(t));
+  const etag = r.headers.get("ETag");
+  if (etag) etags.set(url, etag);
+  return await r.json();
+}
+
 export function startMatchPolling(
   { statusUrl, stateUrl, playerId, onJoin, onOppMove, onUpdateTurn },
   { humInterval = 5000, turnInterval = 2000 } = {}
@@ -12,8 +28,9 @@ export function startMatchPolling(
   // 1) Poll to detect when opponent joins & when it becomes your turn
   const humPoll = setInterval(async () => {
     try {
-      const data = await fetchJson(statusUrl);
+      const data = await fetchIfChanged(statusUrl);
       errorCount = 0;
+      if (!data) return;  // unchanged since the last poll
 
       // fire onJoin once when player two appears
       if (!sawJoin && data.player_two_id) {
@@ -45,8 +62,9 @@ export function startMatchPolling(
   // 2) Poll to update turn-indicator (and show “Game over” when done)
   const turnPoll = setInterval(async () => {
     try {
-      const data = await fetchJson(stateUrl);
+      const data = await fetchIfChanged(stateUrl);
       errorCount = 0;
+      if (!data) return;
 
       onUpdateTurn(data);
 
@@ -70,8 +88,8 @@ export function startMatchPolling(
     try {
       const initStatus = await fetchJson(statusUrl);
       sawJoin = !!initStatus.player_two_id;
-      const initState = await fetchJson(stateUrl);
-      onUpdateTurn(initState);
+      const initState = await fetchIfChanged(stateUrl);
+      if (initState) onUpdateTurn(initState);
     } catch (e) {
       console.error("initial polling error:", e);
     }
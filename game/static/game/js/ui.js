@@ -34,15 +34,18 @@ export function makeCard(card) {
   return wrapper;
 }
 
-// flips = [{ position: ..., owner_id: ... }, ...]
+// flips = [{ position: ..., owner_id: ..., color: ... }, ...]
 export function applyFlips(cellMap, flips, playerId) {
-  flips.forEach(({position, owner_id}) => {
+  flips.forEach(({position, owner_id, color}) => {
     const cell = cellMap[position];
     cell.classList.add("flipped");
     const cardEl = cell.querySelector(".card.in-cell");
     if (cardEl) {
       cardEl.classList.remove("my-card", "opponent-card");
       cardEl.classList.add(owner_id === playerId ? "my-card" : "opponent-card");
+      // the glow set when the card was placed is the old owner's
+      cardEl.style.borderColor = color || "";
+      cardEl.style.boxShadow = color ? `0 0 10px ${color}` : "";
     }
     setTimeout(() => cell.classList.remove("flipped"), 400);
   });
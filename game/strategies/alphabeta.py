@@ -1,111 +1,86 @@
 # game/strategies/alphabeta.py
 
-import math
-from copy import deepcopy
-from .base import BotStrategy
-from game.models import MatchMove, PlayerCard
-from game.utils import check_flips
+import logging
+import time
 
-class GameState:
-    """
-    In‐memory snapshot of a match for alpha-beta.
-    - board: pos→{"player":id,"card":PlayerCard}
-    - decks: player_id→[remaining PlayerCard,…]
-    - current: whose turn (player_id)
-    """
-    def __init__(self, match, current_player_id):
-        moves = MatchMove.objects.filter(match=match)
-        self.board = { m.position: {"player":m.player.id, "card":m.card} for m in moves }
-        # build decks minus played cards
-        self.decks = {}
-        for p in (match.player_one, match.player_two):
-            played = { m.card.id for m in moves.filter(player=p) }
-            all_pc = PlayerCard.objects.filter(owner=p, in_battle_deck=True)
-            self.decks[p.id] = [pc for pc in all_pc if pc.id not in played]
-        self.current = current_player_id
-        self.match   = match
-
-    def get_valid_moves(self):
-        free = [i for i in range(9) if i not in self.board]
-        return [ (pos,card) for pos in free for card in self.decks[self.current] ]
+from django.conf import settings
 
-    def simulate_move(self, move):
-        pos, card = move
-        ns = deepcopy(self)
-        # place
-        ns.board[pos] = {"player":ns.current,"card":card}
-        # remove from deck
-        ns.decks[ns.current] = [c for c in ns.decks[ns.current] if c.id!=card.id]
-        # flips
-        flips = check_flips(ns.board, pos, card)
-        for f in flips:
-            ns.board[f]["player"] = ns.current
-        # switch
-        p1 = ns.match.player_one.id
-        p2 = ns.match.player_two.id
-        ns.current = p2 if ns.current==p1 else p1
-        return ns
+from .base import BotStrategy, endgame_table, parallel_workers
+from game.bots import register_strategy
+from game.engine.parallel import parallel_search
+from game.engine.search import Search
+from game.engine.transposition import TranspositionTable
 
-    def is_terminal(self):
-        return len(self.board) >= 9
-
-    def evaluate_board(self):
-        # (# owned by previous mover) - (by opponent)
-        cnt = {}
-        for info in self.board.values():
-            cnt[info["player"]] = cnt.get(info["player"],0) + 1
-        p1 = self.match.player_one.id
-        p2 = self.match.player_two.id
-        prev = p2 if self.current==p1 else p1
-        opp  = p1 if prev==p2 else p2
-        return cnt.get(prev,0) - cnt.get(opp,0)
+logger = logging.getLogger(__name__)
 
 
+@register_strategy("alphabeta")
 class AlphaBetaBot(BotStrategy):
-    def __init__(self, depth=4):
-        self.depth = depth
-
-    def choose_move(self, match, bot_player):
-        root = GameState(match, bot_player.id)
-        best_score = -math.inf
-        best_move  = None
-        alpha, beta = -math.inf, math.inf
-
-        for move in root.get_valid_moves():
-            score = self._alphabeta(root.simulate_move(move),
-                                    self.depth-1, False,
-                                    alpha, beta)
-            if score > best_score:
-                best_score, best_move = score, move
-            alpha = max(alpha, best_score)
-        if not best_move:
-            return None
-        pos, card = best_move
-        return {"position": pos, "card": card}
+    """
+    Negamax alpha-beta over the compact engine board, with a Zobrist-keyed
+    transposition table that lives as long as the bot instance.
+    Iterative deepening up to the depth `node_budget` affords on the position
+    (`depth` plies when it is 0), stopped by `time_budget` seconds: the move
+    comes from the deepest iteration that finished. Late in the game the
+    budget covers the whole rest of it, and the search becomes a solve.
+    With settings.BOT_PARALLEL_ENABLED the root moves are split across the
+    process pool instead (each worker keeps its own table).
+    Positions in the opening book are answered from it without searching,
+    and so are endings the shared endgame tablebase covers.
+    """
+    ponders = True
 
-    def _alphabeta(self, state, depth, maximizing, alpha, beta):
-        if depth == 0 or state.is_terminal():
-            return state.evaluate_board()
+    def __init__(self, depth=4, time_budget=None, tt_size=1 << 16, workers=None, node_budget=None):
+        self.depth = depth
+        self.time_budget = settings.BOT_TIME_BUDGET if time_budget is None else time_budget
+        self.node_budget = settings.BOT_NODE_BUDGET if node_budget is None else node_budget
+        self.workers = workers
+        self.tt = TranspositionTable(tt_size)
+        self.last_stats = {}
 
-        if maximizing:
-            value = -math.inf
-            for mv in state.get_valid_moves():
-                value = max(value, self._alphabeta(
-                    state.simulate_move(mv),
-                    depth-1, False,
-                    alpha, beta))
-                alpha = max(alpha, value)
-                if alpha >= beta:
-                    break
-            return value
-        else:
-            value = math.inf
-            for mv in state.get_valid_moves():
-                value = min(value, self._alphabeta(
-                    state.simulate_move(mv),
-                    depth-1, True,
-                    alpha, beta))
-                beta = min(beta, value)
-                if beta <= alpha:
-                    break
-            return value
\ No newline at end of file
+    def select_move(self, board):
+        started = time.monotonic()
+        move = self._book_move(board)
+        if move is not None:
+            self.last_stats = {"mode": "book", "elapsed": time.monotonic() - started}
+            logger.info("alphabeta decision %s", self.last_stats)
+            return move
+        endgame = endgame_table()
+        if endgame.covers(board):
+            score, move = endgame.best_move(board)
+            self.last_stats = {"mode": "endgame", "score": score, "elapsed": time.monotonic() - started}
+            logger.info("alphabeta decision %s", self.last_stats)
+            return move
+        target = self._search_depth(board)
+        workers = parallel_workers() if self.workers is None else self.workers
+        # pondering stays off the pool: it could not be aborted there
+        if workers > 1 and self.abort is None:
+            result = parallel_search(board, target, self.time_budget, workers)
+            if result is not None:
+                score, move, depth = result
+                self.last_stats = {
+                    "mode": "parallel",
+                    "depth": depth,
+                    "score": score,
+                    "workers": workers,
+                    "elapsed": time.monotonic() - started,
+                }
+                logger.info("alphabeta decision %s", self.last_stats)
+                return move
+            # pool did not answer in time (cold start): search here with what is left
+        self.tt.new_search()
+        search = Search(self.tt, deadline=started + self.time_budget, abort=self.abort)
+        score, move, depth = search.iterate(board, target)
+        self.last_stats = {
+            "mode": "search",
+            "target": target,
+            "depth": depth,
+            "score": score,
+            "nodes": search.nodes,
+            "cutoffs": search.cutoffs,
+            "tt_hits": self.tt.hits,
+            "elapsed": time.monotonic() - started,
+            "tt": self.tt.stats(),
+        }
+        logger.info("alphabeta decision %s", self.last_stats)
+        return move
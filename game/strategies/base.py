@@ -1,10 +1,119 @@
+import os
+import time
 from abc import ABC, abstractmethod
 
+from django.conf import settings
+
+from game.bot_stats import record_decision
+from game.engine.book import OpeningBook
+from game.engine.endgame import EndgameTable
+from game.engine.loader import load_snapshot
+from game.engine.search import plan_depth
+from game.ponder import pondered_move
+
+
+def parallel_workers():
+    """Processes for root-parallel search, or 0 when it is switched off."""
+    if not getattr(settings, "BOT_PARALLEL_ENABLED", False):
+        return 0
+    return getattr(settings, "BOT_PARALLEL_WORKERS", 0) or os.cpu_count() or 1
+
+
+_book = (None, None)  # (mtime, OpeningBook)
+
+
+def opening_book():
+    """The book at settings.BOT_OPENING_BOOK, reloaded when rebuilt; None without one."""
+    global _book
+    path = getattr(settings, "BOT_OPENING_BOOK", "")
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    if _book[0] != mtime:
+        _book = (mtime, OpeningBook(path))
+    return _book[1]
+
+
+_endgame = None
+
+
+def endgame_table():
+    """Process-wide endgame tablebase, shared by every match and strategy."""
+    global _endgame
+    if _endgame is None:
+        _endgame = EndgameTable(
+            max_cells=getattr(settings, "BOT_ENDGAME_CELLS", 3),
+            max_entries=getattr(settings, "BOT_ENDGAME_ENTRIES", 1 << 17),
+        )
+    return _endgame
+
 
 class BotStrategy(ABC):
-    @abstractmethod
-    def choose_move(self, match, bot_player):
+    # search bots: worth searching the human's likely replies ahead (game.ponder)
+    ponders = False
+    # what select_move measured on its last call (see game.bot_stats)
+    last_stats = {}
+    # record of the last choose_move decision, as stored by game.bot_stats
+    last_decision = None
+    # threading.Event; once set, a running select_move gives up (game.ponder)
+    abort = None
+
+    def choose_move(self, match, bot_player, snapshot=None):
         """
         Return a dict {'position': int, 'card': PlayerCard}, or None.
+        Pass a MatchSnapshot to reuse one already loaded.
+        """
+        if snapshot is None:
+            snapshot = load_snapshot(match)
+        board, cards = snapshot.board(bot_player.id), snapshot.cards
+        started = time.monotonic()
+        move = self._pondered(match.id, board) if self.ponders else None
+        if move is not None:
+            stats = {"mode": "ponder"}
+        else:
+            self.last_stats = {}
+            move = self.select_move(board)
+            stats = self.last_stats
+        self.last_decision = record_decision(
+            match.id, type(self).__name__, board.empty_count(), stats, time.monotonic() - started,
+        )
+        if move is None:
+            return None
+        pos, k = move
+        return {"position": pos, "card": cards[k]}
+
+    def _pondered(self, match_id, board):
+        """The answer pondered for this exact position, if still legal."""
+        hit = pondered_move(match_id, board.hash)
+        if hit is None:
+            return None
+        pos, card_id = hit
+        if card_id not in board.card_ids:
+            return None
+        k = board.card_ids.index(card_id)
+        if pos not in board.free_cells() or k not in board.hand():
+            return None
+        return pos, k
+
+    def _search_depth(self, board):
+        """
+        Plies to search on *board*: planned for the bot's node_budget
+        (see game.engine.search.plan_depth), or its fixed depth when that is 0.
+        """
+        if getattr(self, "node_budget", 0):
+            return plan_depth(board, self.node_budget)
+        return self.depth
+
+    def _book_move(self, board):
+        """Opening-book move for *board*, or None."""
+        book = opening_book()
+        return book.probe(board) if book is not None else None
+
+    @abstractmethod
+    def select_move(self, board):
+        """
+        Return (position, card_index) for board.turn, or None.
+        The board must be left exactly as it was handed in.
         """
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,136 @@
+# game/strategies/mcts.py
+
+import logging
+import math
+import random
+import time
+
+from django.conf import settings
+
+from .base import BotStrategy
+from game.bots import register_strategy
+
+logger = logging.getLogger(__name__)
+
+
+class _Node:
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins', 'mover')
+
+    def __init__(self, board, move=None, parent=None):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = board.moves()
+        self.visits = 0
+        self.wins = 0.0             # from the point of view of `mover`
+        self.mover = board.turn ^ 1  # seat that played `move`
+
+    def select(self, exploration):
+        log_n = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_n / c.visits),
+        )
+
+
+@register_strategy("mcts")
+class MCTSBot(BotStrategy):
+    """
+    Monte Carlo Tree Search with UCT selection.
+      • Stops after `iterations` tree walks or `time_budget` seconds, whichever
+        comes first, so difficulty scales smoothly with the CPU you give it;
+        one walk always runs, so a zero budget still plays a legal move.
+      • Every new leaf is scored by a batch of `batch` random playouts on the
+        in-memory board (make/unmake only, no queries).
+      • Plays the most visited root move.
+    """
+    ponders = True
+
+    def __init__(self, iterations=None, time_budget=None, batch=4, exploration=1.4, **kwargs):
+        # depth=… from load_bot is accepted and ignored
+        self.iterations = settings.BOT_MCTS_ITERATIONS if iterations is None else iterations
+        self.time_budget = settings.BOT_TIME_BUDGET if time_budget is None else time_budget
+        self.batch = batch
+        self.exploration = exploration
+        self.rng = random.Random()
+        self.last_stats = {}
+
+    def select_move(self, board):
+        started = time.monotonic()
+        deadline = started + self.time_budget
+        root = _Node(board)
+        if not root.untried:
+            return None
+
+        playouts = 0
+        iterations = 0
+        while True:
+            # the first iteration always runs: it expands a root move to play
+            if iterations and (
+                iterations >= self.iterations
+                or time.monotonic() >= deadline
+                or (self.abort is not None and self.abort.is_set())
+            ):
+                break
+            iterations += 1
+            node, path = root, []
+
+            # 1) selection
+            while not node.untried and node.children:
+                node = node.select(self.exploration)
+                path.append((node.move, board.make(*node.move)))
+
+            # 2) expansion
+            if node.untried:
+                mv = node.untried.pop(self.rng.randrange(len(node.untried)))
+                path.append((mv, board.make(*mv)))
+                child = _Node(board, mv, node)
+                node.children.append(child)
+                node = child
+
+            # 3) simulation: a batch of playouts from the same leaf
+            results = [self._playout(board) for _ in range(self.batch)]
+            playouts += self.batch
+
+            for mv, captured in reversed(path):
+                board.unmake(*mv, captured)
+
+            # 4) backpropagation
+            while node is not None:
+                node.visits += self.batch
+                node.wins += sum(self._reward(counts, node.mover) for counts in results)
+                node = node.parent
+
+        best = max(root.children, key=lambda c: c.visits)
+        self.last_stats = {
+            "mode": "mcts",
+            # one new tree node per iteration
+            "nodes": iterations,
+            "score": best.wins / best.visits,
+            "iterations": iterations,
+            "playouts": playouts,
+            "elapsed": time.monotonic() - started,
+        }
+        logger.info("mcts decision %s", self.last_stats)
+        return best.move
+
+    def _playout(self, board):
+        """Random moves to the end; returns the final (seat 0, seat 1) cell counts."""
+        rng = self.rng
+        played = []
+        while not board.is_terminal():
+            cells = board.free_cells()
+            cards = board.hand()
+            mv = (cells[rng.randrange(len(cells))], cards[rng.randrange(len(cards))])
+            played.append((mv, board.make(*mv)))
+        counts = board.counts()
+        for mv, captured in reversed(played):
+            board.unmake(*mv, captured)
+        return counts
+
+    @staticmethod
+    def _reward(counts, seat):
+        mine, theirs = counts[seat], counts[seat ^ 1]
+        if mine > theirs:
+            return 1.0
+        return 0.5 if mine == theirs else 0.0
@@ -1,36 +1,25 @@
 import random
 from .base import BotStrategy
-from game.models import PlayerCard, MatchMove
+from game.bots import register_strategy
 
 
 
+@register_strategy("random")
 class RandomBot(BotStrategy):
     def __init__(self, **kwargs):
         # si quieres, lee kwargs['depth'] pero no es obligatorio
         pass
 
-    def choose_move(self, match, bot_player):
+    def select_move(self, board):
         # 1) Free positions
-        occupied = {m.position for m in MatchMove.objects.filter(match=match)}
-        free_positions = [i for i in range(9) if i not in occupied]
+        free_positions = board.free_cells()
         if not free_positions:
             return None
 
         # 2) Bot’s unused battle-deck cards
-        played_ids = {
-            m.card.id 
-            for m in MatchMove.objects.filter(match=match, player=bot_player)
-        }
-        available = list(
-            PlayerCard.objects
-                      .filter(owner=bot_player, in_battle_deck=True)
-                      .exclude(id__in=played_ids)
-        )
+        available = board.hand()
         if not available:
             return None
 
         # 3) Pick random
-        return {
-            'position': random.choice(free_positions),
-            'card':     random.choice(available)
-        }
+        return random.choice(free_positions), random.choice(available)
@@ -0,0 +1,72 @@
+# game/strategies/solver.py
+
+import logging
+import time
+
+from django.conf import settings
+
+from .base import BotStrategy, endgame_table
+from game.bots import register_strategy
+from game.engine.search import Search
+from game.engine.transposition import TranspositionTable
+
+logger = logging.getLogger(__name__)
+
+
+@register_strategy("solver")
+class SolverBot(BotStrategy):
+    """
+    Perfect play from the mid-game on.
+      • In the last few cells: straight from the shared endgame tablebase.
+      • With `solve_at` or fewer empty cells: iterative deepening all the way
+        to the last cell, memoized in a transposition table kept across moves.
+      • Earlier: the opening book if it has the position, else the same
+        search capped at the depth `node_budget` affords (`depth` when it
+        is 0), which is a solve too once the rest of the game fits.
+    Whichever it is, the decision stops at `time_budget` seconds and plays
+    the best move of the deepest finished iteration.
+    """
+    ponders = True
+
+    def __init__(self, depth=4, solve_at=None, time_budget=None, tt_size=1 << 18, node_budget=None):
+        self.depth = depth
+        self.solve_at = settings.BOT_SOLVER_EMPTY_CELLS if solve_at is None else solve_at
+        self.time_budget = settings.BOT_TIME_BUDGET if time_budget is None else time_budget
+        self.node_budget = settings.BOT_NODE_BUDGET if node_budget is None else node_budget
+        self.tt = TranspositionTable(tt_size)
+        self.last_stats = {}
+
+    def select_move(self, board):
+        started = time.monotonic()
+        move = self._book_move(board)
+        if move is not None:
+            self.last_stats = {"mode": "book", "elapsed": time.monotonic() - started}
+            logger.info("solver decision %s", self.last_stats)
+            return move
+        endgame = endgame_table()
+        if endgame.covers(board):
+            score, move = endgame.best_move(board)
+            self.last_stats = {"mode": "endgame", "score": score, "elapsed": time.monotonic() - started}
+            logger.info("solver decision %s", self.last_stats)
+            return move
+        self.tt.new_search()
+        empty = board.empty_count()
+        target = empty if empty <= self.solve_at else self._search_depth(board)
+        solving = target >= empty
+        search = Search(self.tt, deadline=started + self.time_budget, abort=self.abort)
+        score, move, depth = search.iterate(board, target)
+        self.last_stats = {
+            "mode": "solve" if solving and depth >= empty else "heuristic",
+            "target": target,
+            "depth": depth,
+            "score": score,
+            "nodes": search.nodes,
+            "cutoffs": search.cutoffs,
+            "tt_hits": self.tt.hits,
+            "elapsed": time.monotonic() - started,
+            "tt": self.tt.stats(),
+        }
+        if solving and depth < empty and not (self.abort is not None and self.abort.is_set()):
+            logger.info("solver: exact solve hit the %.2fs budget at depth %d", self.time_budget, depth)
+        logger.info("solver decision %s", self.last_stats)
+        return move
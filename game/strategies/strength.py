@@ -1,93 +1,94 @@
 # game/strategies/strength.py
-import random
-from .base import BotStrategy
-from game.models import MatchMove, PlayerCard
-
-# Map from offset to (our_side, their_side)
-_OFFSETS = {
-    -3: ('top',    'bottom'),  # we're below them
-    +3: ('bottom', 'top'),     # we're above them
-    -1: ('left',   'right'),   # we're to their right
-    +1: ('right',  'left'),    # we're to their left
-}
+import numpy as np
 
+from .base import BotStrategy, endgame_table
+from game.bots import register_strategy
+from game.engine import NEIGHBOURS, OPPOSITE
+
+# cell -> neighbor across each side (top, right, bottom, left), -1 at the border
+_NEIGHBOUR = np.full((9, 4), -1, dtype=np.int8)
+for _pos, _links in enumerate(NEIGHBOURS):
+    for _n, _side in _links:
+        _NEIGHBOUR[_pos, _side] = _n
+_OPPOSITE = np.array(OPPOSITE)
+
+# a card lost to a counter-flip weighs this much against a card taken now
+EXPOSURE_WEIGHT = 0.5
+# among equal moves, keep the strongest cards for later
+STRENGTH_TIEBREAK = 1e-3
+
+
+def score_moves(board):
+    """
+    Score every (free cell, distinct card) of the side to move at once.
+    Returns (cells, cards, scores) with scores[i, j] for cards[j] at cells[i]:
+
+      flips      opponent cards it takes right away
+      exposure   for each open side, the share of the opponent's hand that
+                 could take it back from there
+      score      flips - EXPOSURE_WEIGHT * exposure (minus a hair per edge point)
+    """
+    cells = board.free_cells()
+    cards = board.distinct_hand()
+    theirs = board.hand(board.turn ^ 1)
+
+    edges = np.array([board.edges[k] for k in cards], dtype=np.int16)           # (K, 4)
+    placed = np.zeros((9, 4), dtype=np.int16)
+    enemy = np.zeros(9, dtype=bool)
+    occupied = np.zeros(9, dtype=bool)
+    for pos, k in enumerate(board.cells):
+        if k >= 0:
+            placed[pos] = board.edges[k]
+            occupied[pos] = True
+            enemy[pos] = board.owner(pos) != board.turn
+
+    neigh = _NEIGHBOUR[cells]                                                 # (P, 4)
+    inside = neigh >= 0
+    safe = np.where(inside, neigh, 0)
+    facing = placed[safe, _OPPOSITE]                                          # (P, 4)
+    takeable = inside & occupied[safe] & enemy[safe]
+    open_side = inside & ~occupied[safe]
+
+    beats = edges[None, :, :] > facing[:, None, :]                            # (P, K, 4)
+    flips = (beats & takeable[:, None, :]).sum(axis=2)
+
+    if theirs:
+        their_edges = np.array([board.edges[k] for k in theirs], dtype=np.int16)  # (M, 4)
+        # risk[k, s]: share of their cards that beat our side s from across it
+        risk = (their_edges[:, None, _OPPOSITE] > edges[None, :, :]).mean(axis=0)
+        exposure = (open_side[:, None, :] * risk[None, :, :]).sum(axis=2)
+    else:
+        exposure = np.zeros(flips.shape)
+
+    scores = flips - EXPOSURE_WEIGHT * exposure - STRENGTH_TIEBREAK * edges.sum(axis=1)[None, :]
+    return cells, cards, scores
+
+
+@register_strategy("strength")
 class AdvancedStrengthBot(BotStrategy):
     """
-    Heuristic:
-      • Find the free position adjacent to the opponent card with the lowest 'their_side' strength.
-      • Pick the card whose matching 'our_side' strength is the smallest value > that threshold.
-      • If none, pick the highest 'our_side' value.
+    Heuristic, one ply deep:
+      • Score every free cell × card in one NumPy pass (see score_moves):
+        cards taken now, minus how open the placed card is to being taken back.
+      • Play the best; ties keep the stronger cards in hand.
+      • Once the endgame tablebase covers the board, play perfectly instead.
     """
     def __init__(self, **kwargs):
         # si quieres, lee kwargs['depth'] pero no es obligatorio
         pass
-        
-    def choose_move(self, match, bot_player):
-        # 1) Build board map: pos -> {'player':id, 'card':PlayerCard}
-        moves = MatchMove.objects.filter(match=match)
-        board = {m.position: {'player': m.player.id, 'card': m.card} for m in moves}
-
-        # 2) Gather free positions
-        free_positions = [i for i in range(9) if i not in board]
-        if not free_positions:
-            return None
 
-        # 3) Gather available (unused) cards
-        played = {m.card.id for m in moves.filter(player=bot_player)}
-        available = list(
-            PlayerCard.objects
-                      .filter(owner=bot_player, in_battle_deck=True)
-                      .exclude(id__in=played)
-        )
-        if not available:
+    def select_move(self, board):
+        if not board.free_cells() or not board.hand():
             return None
 
-        # 4) Scan each free pos for opponent weakness
-        weakest_spot = None
-        weakest_value = float('inf')
-        weakest_dir   = None
-
-        for pos in free_positions:
-            for offset, (our_side, their_side) in _OFFSETS.items():
-                neigh = pos + offset
-                # ensure pos/neigh wrap logic for rows
-                if 0 <= neigh < 9 and (
-                   (offset == -1 and pos % 3 == 0) or
-                   (offset == +1 and neigh % 3 == 0)
-                ):
-                    continue
-                info = board.get(neigh)
-                if info and info['player'] != bot_player.id:
-                    # opponent card there
-                    opp_card = info['card'].card
-                    val = getattr(opp_card, f'strength_{their_side}')
-                    if val < weakest_value:
-                        weakest_value = val
-                        weakest_spot  = pos
-                        weakest_dir   = our_side
-
-        # If no adjacent enemies, fall back to random spot & best-minimum card
-        if weakest_spot is None:
-            weakest_spot = random.choice(free_positions)
-
-        # 5) Pick the card with minimal our_side > weakest_value
-        #    Otherwise pick the card with max our_side
-        def side_strength(pc, side):
-            s = pc.card
-            return getattr(s, f'strength_{side}')
-
-        # Filter cards that can beat that weakness
-        beating = [pc for pc in available if side_strength(pc, weakest_dir) > weakest_value]
-        if beating:
-            # pick the smallest card that still wins
-            chosen = min(beating, key=lambda pc: side_strength(pc, weakest_dir))
-        else:
-            # no card beats it, pick the one with overall highest min_strength
-            chosen = max(available, key=lambda pc: min(
-                pc.card.strength_top,
-                pc.card.strength_right,
-                pc.card.strength_bottom,
-                pc.card.strength_left
-            ))
-
-        return {"position": weakest_spot, "card": chosen}
+        # Few cells left: the exact answer is cheap
+        endgame = endgame_table()
+        if endgame.covers(board):
+            score, move = endgame.best_move(board)
+            self.last_stats = {"mode": "endgame", "score": score}
+            return move
+
+        cells, cards, scores = score_moves(board)
+        i, j = np.unravel_index(np.argmax(scores), scores.shape)
+        self.last_stats = {"mode": "heuristic", "score": float(scores[i, j]), "nodes": scores.size}
+        return cells[i], cards[j]
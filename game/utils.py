@@ -1,6 +1,9 @@
 # game/utils.py
 
-from .models import Card, PlayerCard, MatchMove
+from .models import Card, PlayerCard
+from .board_state import load_state
+from .engine.board import adjacency, SIDES  # cell -> {side: neighbor}, shared with the bot engine
+from .engine.fliptable import flip_table
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
 
@@ -14,20 +17,6 @@ def initialize_player_deck(player):
         PlayerCard.objects.get_or_create(owner=player, card=card)
 
 
-# adjacency map: for each cell index, which neighbors to compare
-adjacency = {
-    0: {'right': 1, 'bottom': 3},
-    1: {'left': 0, 'right': 2, 'bottom': 4},
-    2: {'left': 1, 'bottom': 5},
-    3: {'top': 0, 'right': 4, 'bottom': 6},
-    4: {'top': 1, 'left': 3, 'right': 5, 'bottom': 7},
-    5: {'top': 2, 'left': 4, 'bottom': 8},
-    6: {'top': 3, 'right': 7},
-    7: {'top': 4, 'left': 6, 'right': 8},
-    8: {'top': 5, 'left': 7},
-}
-
-
 def get_card_stats(player_card):
     """
     Accepts a PlayerCard instance and returns its four edge strengths.
@@ -50,51 +39,70 @@ def check_flips(board, new_pos, new_card_pc):
 
     Returns a list of neighbor positions whose cards should flip.
     """
-    flips = []
-    new_stats = get_card_stats(new_card_pc)
-
-    for direction, neighbor_pos in adjacency.get(new_pos, {}).items():
-        neighbor = board.get(neighbor_pos)
-        if not neighbor:
+    cards = {}
+    for pos, entry in board.items():
+        if not entry:
             continue
+        # old API style / MatchMove instance style
+        cards[pos] = entry['card'].card_id if isinstance(entry, dict) else entry.card.card_id
+    return flips_for(cards, new_pos, new_card_pc.card_id)
 
-        # Extract the PlayerCard for that neighbor:
-        if isinstance(neighbor, dict):
-            # old API style
-            neighbor_pc = neighbor['card']
-        else:
-            # MatchMove instance style
-            neighbor_pc = neighbor.card
-
-        neighbor_stats = get_card_stats(neighbor_pc)
-
-        # Compare edge values based on direction
-        if direction == 'top' and new_stats['top'] > neighbor_stats['bottom']:
-            flips.append(neighbor_pos)
-        elif direction == 'bottom' and new_stats['bottom'] > neighbor_stats['top']:
-            flips.append(neighbor_pos)
-        elif direction == 'left' and new_stats['left'] > neighbor_stats['right']:
-            flips.append(neighbor_pos)
-        elif direction == 'right' and new_stats['right'] > neighbor_stats['left']:
-            flips.append(neighbor_pos)
-
-    return flips
 
+def flips_for(cards_at, new_pos, card_id):
+    """
+    cards_at: mapping position -> Card id of the cards on the board
+    Returns the neighbor positions Card *card_id* placed at *new_pos* beats.
+    Each comparison is a single read from the catalog FlipTable, keyed by
+    Card id, so no Card rows are loaded here.
+    """
+    neighbors = []
+    for direction, neighbor_pos in adjacency.get(new_pos, {}).items():
+        neighbor_card = cards_at.get(neighbor_pos)
+        if neighbor_card is None:
+            continue
+        neighbors.append((neighbor_pos, SIDES.index(direction), neighbor_card))
 
-def serialize_board(match):
-    moves = MatchMove.objects.filter(match=match).order_by('position', 'pk')
+    table = flip_table([card_id] + [c for _, _, c in neighbors])
+    kind = table.kind_of[card_id]
     return [
-        {
-            "position": m.position,
-            "player_id": m.player.id,
-            "player_card_id": m.card.id,
-            "card_name": m.card.card.name,
-            "image": m.card.card.image.url,
-            "card_top": m.card.card.strength_top,
-            "card_right": m.card.card.strength_right,
-            "card_bottom": m.card.card.strength_bottom,
-            "card_left": m.card.card.strength_left,
-            "color": "#1f77b4" if m.player == match.player_one else "#ff7f0e"
-        }
-        for m in moves
+        pos for pos, side, c in neighbors
+        if table.beats(kind, side, table.kind_of[c])
     ]
+
+
+def serialize_board(match, request=None, positions=None):
+    """
+    The board as the clients draw it, read from match.board_state: one
+    query for the Card rows on it. With a *request*, image URLs are absolute;
+    *positions* limits it to those cells (a delta, see changes_since).
+    """
+    cells = load_state(match)["cells"]
+    if positions is not None:
+        cells = [cell if pos in positions else None for pos, cell in enumerate(cells)]
+    ids = {cell[2] for cell in cells if cell is not None}
+    cards = Card.objects.in_bulk(ids) if ids else {}
+    board = []
+    for pos, cell in enumerate(cells):
+        if cell is None:
+            continue
+        owner_id, player_card_id, card_id = cell
+        card = cards[card_id]
+        image = card.image.url
+        board.append({
+            "position": pos,
+            "player_id": owner_id,
+            "player_card_id": player_card_id,
+            "card_name": card.name,
+            "image": request.build_absolute_uri(image) if request else image,
+            "card_top": card.strength_top,
+            "card_right": card.strength_right,
+            "card_bottom": card.strength_bottom,
+            "card_left": card.strength_left,
+            "color": owner_color(match, owner_id)
+        })
+    return board
+
+
+def owner_color(match, owner_id):
+    """Border colour of a card owned by *owner_id*, as the board draws it."""
+    return "#1f77b4" if owner_id == match.player_one_id else "#ff7f0e"
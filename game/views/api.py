@@ -1,15 +1,29 @@
+import time
+
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.conf import settings
+from django.utils.http import parse_etags
 
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate, login
 
-from game.models        import Player, PlayerCard, Match, MatchMove, ShopCard
-from game.utils         import initialize_player_deck, check_flips, serialize_board
+from game.models        import Player, PlayerCard, Match, ShopCard
+from game.utils         import initialize_player_deck, owner_color, serialize_board
 from game.bots          import load_bot
+from game.engine.loader import load_snapshot
+from game.engine.analysis import AnalysisCache, analyse
+from game.strategies.base import endgame_table
+from game.bot_worker    import schedule_bot_move
+from game.bot_stats     import recent_decisions, summary
+from game.ponder        import cancel_pondering
+from game.moves         import MoveError, concede, named_scores, play_move
+from game.board_state   import changes_since, load_state
+from game.match_cache   import fingerprint_of, hot_matches, state_etag
 
 from channels.layers    import get_channel_layer
 from asgiref.sync       import async_to_sync
@@ -136,7 +150,7 @@ def join_match(request):
         return Response({"error": "Match full"}, status=400)
     player = get_object_or_404(Player, id=request.data.get("player_id"))
     match.player_two = player
-    match.save()
+    match.save(update_fields=["player_two"])
     
     broadcast_match_joined(match)
     return Response({"match_id": match.id, "message": "Joined match"})
@@ -145,36 +159,183 @@ def join_match(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_match_state(request, match_id):
+    """
+    Served from the hot match cache while the match is live; a miss loads
+    and caches it. Cached payloads hold relative image URLs.
+
+    Responses carry a weak ETag; a poll sending it back in If-None-Match
+    gets 304 as long as no move, turn change, join or result happened,
+    without the payload being built (or even read, on a cache miss).
+    """
+    cached = hot_matches().get(match_id)
+    if cached is None:
+        fingerprint = fingerprint_of(match_id)
+        if fingerprint is None:
+            raise Http404("No Match matches the given query.")
+        etag = state_etag(match_id, fingerprint)
+        if _not_modified(request, etag):
+            return _not_modified_response(etag)
+        match = get_object_or_404(
+            Match.objects.select_related(
+                "player_one__user", "player_two__user", "current_turn__user", "winner__user",
+            ),
+            id=match_id,
+        )
+        state = MatchStateSerializer(match).data
+        etag = hot_matches().put(match, state)
+    else:
+        state, etag = cached
+        if _not_modified(request, etag):
+            return _not_modified_response(etag)
+    state = dict(state)
+    state["board"] = [
+        {**cell, "image": request.build_absolute_uri(cell["image"])} for cell in state["board"]
+    ]
+    response = Response(state)
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+def _not_modified(request, etag):
+    """If-None-Match of *request* lists *etag* (weak comparison, as RFC 9110 has it)."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or etag.removeprefix("W/") in {e.removeprefix("W/") for e in etags}
+
+
+def _not_modified_response(etag):
+    response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_match_changes(request, match_id):
+    """
+    What changed since version ?since=N (MatchStateSerializer.version):
+    the cards placed after it, the other cells that changed owner (final
+    owner), and the current scores and turn. When the match's move log does
+    not reach back to N the whole state comes back instead, with
+    "full": true.
+    """
+    try:
+        since = int(request.query_params.get("since", ""))
+    except ValueError:
+        return Response({"error": "since must be a version number"}, status=400)
+    match = get_object_or_404(
+        Match.objects.select_related(
+            "player_one__user", "player_two__user", "current_turn__user", "winner__user",
+        ),
+        id=match_id,
+    )
+    state = load_state(match)
+    changes = changes_since(state, since)
+    if changes is None:
+        full = MatchStateSerializer(match, context={'request': request}).data
+        return Response({**full, "full": True})
+    placed, flipped = changes
+    payload = _turn_payload(match, named_scores(match, state), since)
+    payload.update({
+        "full": False,
+        "placed": serialize_board(match, request, positions=set(placed)),
+        "flips": [_flip(match, state, pos) for pos in flipped],
+    })
+    return Response(payload)
+
+
+_analysis_cache = None
+
+
+def analysis_cache():
+    """Process-wide analysis results, shared by every match and viewer."""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache(
+            max_entries=settings.ANALYSIS_CACHE_ENTRIES,
+            ttl=settings.ANALYSIS_CACHE_TTL,
+        )
+    return _analysis_cache
+
+
+def _analyse(board):
+    return analyse(
+        board,
+        settings.ANALYSIS_NODE_BUDGET,
+        deadline=time.monotonic() + settings.ANALYSIS_TIME_BUDGET,
+        endgame=endgame_table(),
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_match_analysis(request, match_id):
+    """
+    Every legal move of the side to move, best first, with its search score
+    (final cell difference for that side) and the cells it would flip.
+    Cards with identical edges are listed once.
+    """
     match = get_object_or_404(Match, id=match_id)
-    serializer = MatchStateSerializer(match, context={'request': request})
-    return Response(serializer.data)
+    if not match.is_active or match.current_turn_id is None:
+        return Response({"error": "Match is not in progress"}, status=400)
+    snapshot = load_snapshot(match)
+    board = snapshot.board(match.current_turn_id)
+    depth, rows, cached = analysis_cache().analysis(board, _analyse)
+    return Response({
+        "match_id": match.id,
+        "current_turn_id": match.current_turn_id,
+        "depth": depth,
+        "exact": depth >= board.empty_count(),
+        "cached": cached,
+        "moves": [
+            {
+                "position": pos,
+                "player_card_id": snapshot.cards[k].id,
+                "template_card_id": snapshot.cards[k].card_id,
+                "score": score,
+                "flips": flips,
+            }
+            for pos, k, score, flips in rows
+        ],
+    })
 
 
 
 MAX_BOT_TRIES = 9
 
 def execute_bot_move(match, bot_player):
+    """
+    Let the bot pick and play its move. Returns (move_info, MoveResult),
+    or (None, None) when it found nothing playable. Raises MoveError when
+    the turn is no longer the bot's (another request played it).
+    """
     strategy = getattr(bot_player, "bot_strategy", "random")
     try:
-        bot = load_bot(strategy, depth=2)
+        bot = load_bot(strategy, player=bot_player)
     except ValueError:
-        bot = load_bot("random", depth=2)
+        bot = load_bot("random")
+    # the search runs outside the transaction: the match is only locked to play
+    snapshot = load_snapshot(match)
     for _ in range(MAX_BOT_TRIES):
-        # Always rebuild the board_map from latest DB state!
-        board_map = {m.position: m for m in MatchMove.objects.filter(match=match)}
-        taken = set(board_map.keys())
-        decision = bot.choose_move(match, bot_player)
-        if not decision or decision["position"] in taken:
+        decision = bot.choose_move(match, bot_player, snapshot)
+        if not decision:
+            continue
+        try:
+            result = play_move(match, bot_player, decision["card"], decision["position"])
+        except MoveError:
+            if not match.is_active or match.current_turn_id != bot_player.id:
+                raise
+            # the board moved on under the search: read it again
+            snapshot = load_snapshot(match)
             continue
-        flips = check_flips(board_map, decision["position"], decision["card"])
-        for pos in flips:
-            mv = board_map[pos]
-            mv.player = bot_player
-            mv.save()
-        # Add the bot's new move
-        MatchMove.objects.create(match=match, player=bot_player, card=decision["card"], position=decision["position"])
         move_info = {
             "position": decision["position"],
+            "player_id": bot_player.id,
+            "color": owner_color(match, bot_player.id),
             "player_card_id": decision["card"].id,
             "template_card_id": decision["card"].card.id,
             "card_name": decision["card"].card.name,
@@ -184,120 +345,124 @@ def execute_bot_move(match, bot_player):
             "card_bottom": decision["card"].card.strength_bottom,
             "card_left": decision["card"].card.strength_left
         }
-        return move_info, flips
-    return None, []
+        if settings.DEBUG:
+            # nodes, depth, timing… of this decision (see game.bot_stats)
+            move_info["stats"] = bot.last_decision
+        return move_info, result
+    return None, None
+
+
+def _flips_payload(match, result):
+    # a beaten card of the mover's own is listed too: report the final owner
+    return [_flip(match, result.state, pos) for pos in result.flips]
 
 
+def _flip(match, state, pos):
+    owner_id = state["cells"][pos][0]
+    return {"position": pos, "owner_id": owner_id, "color": owner_color(match, owner_id)}
+
+
+def _turn_payload(match, named_scores, since):
+    """
+    Scores and turn after a move. The board is sent as a delta: a client
+    at version *since* applies the placed card(s) and flips to reach
+    "version"; any other client catches up with match/<id>/changes/.
+    """
+    return {
+        "since": since,
+        "version": load_state(match)["version"],
+        "named_scores": named_scores,
+        "game_over": not match.is_active,
+        "winner": match.winner.user.username if match.winner else None,
+        "winner_id": match.winner.id if match.winner else None,
+        "current_turn_id": match.current_turn.id if match.current_turn else None,
+        "current_turn_name": match.current_turn.user.username if match.current_turn else None
+    }
+
+
+def play_bot_turn(match, bot_player):
+    """
+    Play the bot's move in *match* and return the move payload
+    (bot_move, bot_flips plus board, scores and turn), or None when the
+    turn was no longer the bot's: whoever played it reports that move.
+    """
+    try:
+        bot_move, result = execute_bot_move(match, bot_player)
+        if result is None:
+            # the bot is stuck: the human wins
+            concede(match, bot_player)
+    except MoveError:
+        return None
+    if result is None:
+        state = load_state(match)
+        payload = _turn_payload(match, named_scores(match, state), since=state["version"])
+        payload.update({"bot_move": None, "bot_flips": []})
+        return payload
+    payload = _turn_payload(match, result.named_scores, since=result.state["version"] - 1)
+    payload.update({"bot_move": bot_move, "bot_flips": _flips_payload(match, result)})
+    return payload
+
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def make_move(request):
     data = request.data
-    match = get_object_or_404(Match, id=data.get("match_id"))
+    match = get_object_or_404(
+        Match.objects.select_related("player_one__user", "player_two__user"),
+        id=data.get("match_id"),
+    )
     player = get_object_or_404(Player, id=data.get("player_id"))
-    if not match.is_active or match.current_turn != player:
-        return Response({"error": "Invalid move"}, status=400)
     card_obj = get_object_or_404(PlayerCard, id=data.get("card_id"), owner=player, in_battle_deck=True)
-    position = data.get("position")
-    board_map = {m.position: m for m in MatchMove.objects.filter(match=match)}
-    flips = check_flips(board_map, position, card_obj)
-    for pos in flips:
-        mv = board_map[pos]
-        mv.player = player
-        mv.save()
-    MatchMove.objects.create(match=match, player=player, card=card_obj, position=position)
-    next_player = match.player_two if player == match.player_one else match.player_one
-    if getattr(next_player, "is_bot", False):
-        bot_move, bot_flips = execute_bot_move(match, next_player)
-        if bot_move is None:
-            match.is_active = False
-            match.winner = player
-            match.current_turn = None
-        else:
-            # After bot moves, it's human's turn again
-            match.current_turn = player
-    else:
-        bot_move, bot_flips = None, []
-        match.current_turn = next_player
-
-    match.save()
-    moves = MatchMove.objects.filter(match=match).order_by('position', 'pk')
-    board_final = {m.position: m for m in moves}
-    p1 = match.player_one
-    p2 = match.player_two
-    p1_score = sum(1 for mv in board_final.values() if mv.player == p1)
-    p2_score = sum(1 for mv in board_final.values() if p2 and mv.player == p2)
-    named_scores = {p1.user.username: p1_score}
-    if p2: named_scores[p2.user.username] = p2_score
-    total_positions = len(board_final)
-    
-    if not match.is_active or total_positions >= 9:
-        if match.winner is None:
-            if p1_score > p2_score:
-                match.winner = p1
-            elif p2 and p2_score > p1_score:
-                match.winner = p2
-            else:
-                match.winner = None  # It's a draw
-        match.is_active = False
-        match.is_finished = True
-        match.save()
-
-        
+    try:
+        # a full board ends the match here, before the bot gets a turn
+        result = play_move(match, player, card_obj, data.get("position"))
+    except MoveError as e:
+        return Response({"error": f"Invalid move: {e}"}, status=400)
+    next_player = match.current_turn
+    since = result.state["version"] - 1
+
     response = {
-        # "flips": flips,
-        # "bot_flips": bot_flips,
-        "flips": [
-            {"position": pos, "owner_id": board_map[pos].player.id}
-            for pos in flips
-        ],
-        # for bot:
-        "bot_flips": [
-            {"position": pos, "owner_id": board_map[pos].player.id}
-            for pos in bot_flips
-        ],
-        "board": serialize_board(match),
-        "bot_move": bot_move,
-        "named_scores": named_scores,
-        "game_over": not match.is_active,
-        "winner": match.winner.user.username if match.winner else None,        
-        "winner_id": match.winner.id if match.winner else None,
-        "current_turn_id": match.current_turn.id if match.current_turn else None,
-        "current_turn_name": match.current_turn.user.username if match.current_turn else None
+        "move": serialize_board(match, positions={result.move.position})[0],
+        "flips": _flips_payload(match, result),
+        "bot_flips": [],
+        "bot_move": None,
+        "bot_pending": False,
     }
+    response.update(_turn_payload(match, result.named_scores, since))
+    if match.is_active and getattr(next_player, "is_bot", False):
+        if settings.BOT_ASYNC_MOVES:
+            # answered later with a "bot_move" event on the match socket
+            response["bot_pending"] = True
+            schedule_bot_move(match.id, next_player.id, announce=response)
+        else:
+            bot_payload = play_bot_turn(match, next_player)
+            if bot_payload is not None:
+                response.update(bot_payload)
+                response["since"] = since  # both moves in one delta
     return Response(response)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def battle_bot(request):
-    match = get_object_or_404(Match, id=request.data.get("match_id"), is_active=True)
+    match = get_object_or_404(
+        Match.objects.select_related("player_one__user", "player_two__user"),
+        id=request.data.get("match_id"), is_active=True,
+    )
     bot_player = match.player_two
     if not getattr(bot_player, "is_bot", False):
         return Response({"error": "No bot attached"}, status=400)
-    human = match.player_one if bot_player == match.player_two else match.player_two
-    bot_move, bot_flips = execute_bot_move(match, bot_player)
-    match.current_turn = human
-    match.save()
-    moves = MatchMove.objects.filter(match=match).order_by('position', 'pk')
-    board_final = {m.position: m for m in moves}
-    p1 = match.player_one
-    p2 = match.player_two
-    named_scores = {p1.user.username: sum(1 for mv in board_final.values() if mv.player == p1)}
-    if p2: named_scores[p2.user.username] = sum(1 for mv in board_final.values() if mv.player == p2)
-    board_map = {m.position: m for m in MatchMove.objects.filter(match=match)}
+    if match.current_turn_id != bot_player.id:
+        return Response({"error": "Not the bot's turn"}, status=400)
+    try:
+        bot_move, result = execute_bot_move(match, bot_player)
+    except MoveError:
+        return Response({"error": "Not the bot's turn"}, status=400)
+    if result is None:
+        return Response({"error": "Bot has no move"}, status=400)
 
-    return Response({
-        "bot_move": bot_move,
-        # "bot_flips": bot_flips,
-        "bot_flips": [
-            {"position": pos, "owner_id": board_map[pos].player.id}
-            for pos in bot_flips
-        ],
-        "board": serialize_board(match),
-        "named_scores": named_scores,
-        "current_turn_id": human.id,
-        "current_turn_name": human.user.username
-    })
+    payload = _turn_payload(match, result.named_scores, since=result.state["version"] - 1)
+    payload.update({"bot_move": bot_move, "bot_flips": _flips_payload(match, result)})
+    return Response(payload)
 
 
 @api_view(['POST'])
@@ -309,7 +474,8 @@ def forfeit_match(request):
     match.is_active = False
     match.is_finished = True
     match.winner = opponent
-    match.save()
+    match.save(update_fields=["is_active", "is_finished", "winner"])
+    cancel_pondering(match.id)
     state = MatchStateSerializer(match).data
     state["forfeited"] = True
     channel_layer = get_channel_layer()
@@ -319,6 +485,29 @@ def forfeit_match(request):
     return Response(state)
 
 
+# ─── Bot stats ───────────────────────────────────────────────────────
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def bot_stats(request):
+    """
+    Recent bot decisions of this process, newest first, plus per-strategy
+    aggregates. Filters: ?strategy=AlphaBetaBot&match_id=12&limit=100
+    """
+    try:
+        limit = int(request.query_params.get("limit", 100))
+        match_id = request.query_params.get("match_id")
+        match_id = int(match_id) if match_id else None
+    except ValueError:
+        return Response({"error": "limit and match_id must be integers"}, status=400)
+    decisions = recent_decisions(
+        limit=limit,
+        strategy=request.query_params.get("strategy") or None,
+        match_id=match_id,
+    )
+    return Response({"summary": summary(), "decisions": decisions})
+
+
 # ─── Shop ─────────────────────────────────────────────────────────────
 
 @api_view(['GET'])
@@ -114,7 +114,7 @@ def battle_view(request, match_id):
     # If slot 2 is open and this user is not the host, auto-join
     if match.player_two is None and player != match.player_one:
         match.player_two = player
-        match.save()
+        match.save(update_fields=["player_two"])
         broadcast_match_joined(match)
 
     # Not a player if not p1 or p2
@@ -39,7 +39,7 @@ def join_match(request):
     match     = get_object_or_404(Match, id=match_id)
     if match.player_two is None:
         match.player_two = get_object_or_404(Player, id=player_id)
-        match.save()
+        match.save(update_fields=["player_two"])
 
 
     broadcast_match_joined(match)
@@ -74,7 +74,7 @@ def quick_match(request):
 
     if match:
         match.player_two = player
-        match.save()
+        match.save(update_fields=["player_two"])
         broadcast_match_joined(match)  # <--- important!
     else:
         match = Match.objects.create(
@@ -92,7 +92,7 @@ def quick_match(request):
 @login_required
 def start_bot_match(request, match_id):
     """
-    Attaches a bot (Random, MinMax, or Advanced Strength) as Player Two,
+    Attaches a bot (Random, MinMax, Advanced Strength, Solver or MCTS) as Player Two,
     naming them appropriately so the front end shows the right label.
     """
     # 1) Read the chosen strategy ('random','minmax','advanced', etc.)
@@ -105,6 +105,8 @@ def start_bot_match(request, match_id):
         'advanced': 'BrainBot',
         'strength': 'BrainBot',
         'heuristic':'BrainBot',
+        'solver':   'Oracle Bot',
+        'mcts':     'Monty Bot',
     }
     display_name = name_map.get(strategy, strategy.title())
 
@@ -128,7 +130,7 @@ def start_bot_match(request, match_id):
 
     # 6) Attach and go to the battle
     match.player_two = bot_player
-    match.save()
+    match.save(update_fields=["player_two"])
     return redirect('battle_view', match_id=match.id)
 
 
@@ -1,42 +1,12 @@
 from rest_framework import serializers
-from game.models import Match, MatchMove
-
-class MatchMoveSerializer(serializers.ModelSerializer):
-    player_id       = serializers.IntegerField(source='player.id')
-    player_card_id  = serializers.IntegerField(source='card.id')
-    card_name       = serializers.CharField(source='card.card.name')
-    image           = serializers.SerializerMethodField()
-    card_top        = serializers.IntegerField(source='card.card.strength_top')
-    card_right      = serializers.IntegerField(source='card.card.strength_right')
-    card_bottom     = serializers.IntegerField(source='card.card.strength_bottom')
-    card_left       = serializers.IntegerField(source='card.card.strength_left')
-    color           = serializers.SerializerMethodField()
-
-    def get_image(self, obj):
-        req = self.context.get('request')
-        return req.build_absolute_uri(obj.card.card.image.url) if req else obj.card.card.image.url
-
-    def get_color(self, obj):
-        # Default colors; you can improve logic if you add player color fields
-        return '#1f77b4' if obj.player == obj.match.player_one else '#ff7f0e'
-
-    class Meta:
-        model = MatchMove
-        fields = [
-            'position',
-            'player_id',
-            'player_card_id',
-            'card_name',
-            'image',
-            'card_top',
-            'card_right',
-            'card_bottom',
-            'card_left',
-            'color',
-        ]
+from game.models import Match
+from game.board_state import load_state
+from game.moves import named_scores
+from game.utils import serialize_board
 
 class MatchStateSerializer(serializers.ModelSerializer):
-    board = MatchMoveSerializer(many=True, source='moves')
+    board = serializers.SerializerMethodField()
+    version = serializers.SerializerMethodField()
     named_scores = serializers.SerializerMethodField()
     player_two = serializers.SerializerMethodField()
     game_over = serializers.SerializerMethodField()
@@ -59,7 +29,8 @@ class MatchStateSerializer(serializers.ModelSerializer):
             'player_one',
             'player_two',
             'named_scores',
-            'board'
+            'board',
+            'version',
         ]
 
     def get_game_over(self, match):
@@ -81,8 +52,12 @@ class MatchStateSerializer(serializers.ModelSerializer):
         return match.player_two.user.username if match.player_two else None
 
     def get_named_scores(self, match):
-        scores = {}
-        for mv in match.moves.all():
-            name = mv.player.user.username
-            scores[name] = scores.get(name, 0) + 1
-        return scores
+        return named_scores(match, load_state(match))
+
+    def get_version(self, match):
+        # moves played; deltas (match/<id>/changes/) count from here
+        return load_state(match)["version"]
+
+    def get_board(self, match):
+        # straight from match.board_state, no MatchMove rows
+        return serialize_board(match, self.context.get('request'))
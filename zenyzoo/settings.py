@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import json
 import os
 from pathlib import Path
 import dj_database_url
@@ -178,6 +179,52 @@ CDN_URL = os.environ.get(
 MEDIA_URL = CDN_URL + '/media/'
 MEDIA_ROOT = CDN_URL + '/media/' # BASE_DIR / 'media' #
 
+# Bot search: plies searched by the minimax/alpha-beta bots per move
+BOT_SEARCH_DEPTH = int(os.environ.get('BOT_SEARCH_DEPTH', 4))
+# Search bots: pick the depth per move to stay near this many nodes, solving
+# outright once the rest of the game fits (0 = always BOT_SEARCH_DEPTH)
+BOT_NODE_BUDGET = int(os.environ.get('BOT_NODE_BUDGET', 50000))
+# Solver bot: solve exactly once this many cells (or fewer) are empty
+BOT_SOLVER_EMPTY_CELLS = int(os.environ.get('BOT_SOLVER_EMPTY_CELLS', 6))
+# Wall-clock budget (seconds) for one bot decision
+BOT_TIME_BUDGET = float(os.environ.get('BOT_TIME_BUDGET', 1.0))
+# Root-parallel search for minmax/alphabeta on a process pool (0 workers = one per CPU)
+BOT_PARALLEL_ENABLED = os.environ.get('BOT_PARALLEL_ENABLED', '').lower() in ('1', 'true', 'yes')
+BOT_PARALLEL_WORKERS = int(os.environ.get('BOT_PARALLEL_WORKERS', 0))
+# MCTS bot: tree walks per move (BOT_TIME_BUDGET still caps it)
+BOT_MCTS_ITERATIONS = int(os.environ.get('BOT_MCTS_ITERATIONS', 2000))
+# Answer human moves at once and push the bot's reply over the match socket
+BOT_ASYNC_MOVES = os.environ.get('BOT_ASYNC_MOVES', 'true').lower() in ('1', 'true', 'yes')
+BOT_WORKER_THREADS = int(os.environ.get('BOT_WORKER_THREADS', 4))
+# Pondering: human replies the search bots pre-answer while waiting (0 = off)
+BOT_PONDER_MOVES = int(os.environ.get('BOT_PONDER_MOVES', 6))
+BOT_PONDER_THREADS = int(os.environ.get('BOT_PONDER_THREADS', 2))
+# Opening book written by `manage.py build_opening_book`; bots skip it when missing
+BOT_OPENING_BOOK = os.environ.get('BOT_OPENING_BOOK', str(BASE_DIR / 'opening_book.bin'))
+# Endgame tablebase: exact values once this many cells (or fewer) are empty
+BOT_ENDGAME_CELLS = int(os.environ.get('BOT_ENDGAME_CELLS', 3))
+BOT_ENDGAME_ENTRIES = int(os.environ.get('BOT_ENDGAME_ENTRIES', 1 << 17))
+# Per-strategy constructor options, e.g. {"alphabeta": {"depth": 6, "time_budget": 1.5}};
+# a bot Player's bot_options override them (see game.bots)
+BOT_STRATEGIES = json.loads(os.environ.get('BOT_STRATEGIES', '{}'))
+# Move analysis API (match/<id>/analysis/): search size per position and result cache
+ANALYSIS_NODE_BUDGET = int(os.environ.get('ANALYSIS_NODE_BUDGET', 30000))
+ANALYSIS_TIME_BUDGET = float(os.environ.get('ANALYSIS_TIME_BUDGET', 2.0))
+ANALYSIS_CACHE_ENTRIES = int(os.environ.get('ANALYSIS_CACHE_ENTRIES', 4096))
+ANALYSIS_CACHE_TTL = int(os.environ.get('ANALYSIS_CACHE_TTL', 600))
+# Search stats of the last N bot decisions kept per process (see game.bot_stats)
+BOT_STATS_BUFFER = int(os.environ.get('BOT_STATS_BUFFER', 1000))
+# Seconds between checks of the Card rows against this process's flip table,
+# so card edits made by another process (seed_cards, admin) are picked up
+FLIP_TABLE_RECHECK = float(os.environ.get('FLIP_TABLE_RECHECK', 2))
+# State payloads of live matches kept per process (see game.match_cache)
+HOT_MATCH_ENTRIES = int(os.environ.get('HOT_MATCH_ENTRIES', 1024))
+HOT_MATCH_BYTES = int(os.environ.get('HOT_MATCH_BYTES', 8 << 20))
+HOT_MATCH_IDLE_TTL = int(os.environ.get('HOT_MATCH_IDLE_TTL', 300))
+# Seconds before a cached state is re-checked against the database; 0 trusts
+# the write-through, which only holds with a single process (daphne here)
+HOT_MATCH_REVALIDATE = float(os.environ.get('HOT_MATCH_REVALIDATE', 0))
+
 LOGIN_URL = '/game/login/'
 
 LOGIN_REDIRECT_URL = '/game/'